@@ -0,0 +1,276 @@
+"""Analytical schedulability tests over ``Scheduler.tasks``.
+
+The tests answer in microseconds for the common cases and say whether a
+simulation is still required:
+
+* Liu & Layland and hyperbolic utilization bounds for RM,
+* exact response-time analysis for RM/DM, including D != T,
+* processor-demand analysis for EDF.
+
+The tests assume every periodic job can be released at t = 0 together (the
+critical instant). With release offsets in the task file a positive verdict
+still holds, but a negative one becomes inconclusive. Poller and Deferrable
+servers in this simulator may defer their budget inside a period, so when
+aperiodic work exists they are modelled as periodic tasks with release
+jitter Ts - Cs. Sporadic and Constant Bandwidth servers are no worse than a
+periodic task (Cs, Ts) and are modelled as one. The Total Bandwidth Server
+only guarantees a demand of at most Us per time unit, which is covered by
+the EDF test when every deadline is at least the period.
+"""
+import math
+from collections import namedtuple
+
+# schedulable: True / False, or None when the analysis is inconclusive
+Verdict = namedtuple("Verdict", "schedulable test needs_simulation detail")
+
+EPSILON = 1e-9
+# Above this many deadline checkpoints the demand test gives up
+MAX_DEMAND_POINTS = 200000
+# Above this many jobs in a level-i busy period the response-time analysis gives up
+MAX_BUSY_JOBS = 100000
+
+# (C, T, D, J, name) tuples used by the tests below
+_Load = namedtuple("_Load", "execution period deadline jitter name")
+
+# Servers that can hold their budget back, modelled with release jitter Ts - Cs
+DEFERRING_SERVERS = ("Poller", "Deferrable")
+
+
+def _ceil(x):
+    return math.ceil(x - EPSILON)
+
+
+def _floor(x):
+    return math.floor(x + EPSILON)
+
+
+def periodic_tasks(tasks):
+    return [t for t in tasks if t.task_type == 'Periodic']
+
+
+def utilization(tasks):
+    return sum(t.execution / t.period for t in periodic_tasks(tasks) if t.period > 0)
+
+
+def _loads(tasks, server_type, s_period, s_budget):
+    """Periodic tasks plus the server stand-in, as analysis loads."""
+    loads = [_Load(t.execution, t.period, t.deadline, 0.0, t.name) for t in periodic_tasks(tasks)]
+    has_aperiodic = any(t.task_type == 'Aperiodic' for t in tasks)
+    if server_type != 'Background' and has_aperiodic and s_budget > 0:
+        jitter = float(s_period) - float(s_budget) if server_type in DEFERRING_SERVERS else 0.0
+        loads.append(_Load(float(s_budget), float(s_period), float(s_period), jitter, "Server"))
+    return loads
+
+
+def liu_layland_test(tasks):
+    """Sufficient RM bound U <= n(2^(1/n) - 1), valid when every D >= T."""
+    periodic = periodic_tasks(tasks)
+    if not periodic:
+        return Verdict(True, "Liu & Layland", False, "no periodic tasks")
+    if any(t.deadline < t.period for t in periodic):
+        return Verdict(None, "Liu & Layland", True, "requires D >= T")
+    n = len(periodic)
+    u = utilization(periodic)
+    bound = n * (2 ** (1.0 / n) - 1)
+    if u <= bound + EPSILON:
+        return Verdict(True, "Liu & Layland", False, f"U={u:.4f} <= {bound:.4f}")
+    return Verdict(None, "Liu & Layland", True, f"U={u:.4f} > {bound:.4f}")
+
+
+def hyperbolic_test(tasks):
+    """Sufficient RM bound prod(U_i + 1) <= 2 (Bini et al.), valid when every D >= T."""
+    periodic = periodic_tasks(tasks)
+    if not periodic:
+        return Verdict(True, "Hyperbolic bound", False, "no periodic tasks")
+    if any(t.deadline < t.period for t in periodic):
+        return Verdict(None, "Hyperbolic bound", True, "requires D >= T")
+    product = 1.0
+    for t in periodic:
+        product *= t.execution / t.period + 1
+    if product <= 2 + EPSILON:
+        return Verdict(True, "Hyperbolic bound", False, f"prod(U+1)={product:.4f} <= 2")
+    return Verdict(None, "Hyperbolic bound", True, f"prod(U+1)={product:.4f} > 2")
+
+
+def _interference(window, higher):
+    return sum(_ceil((window + h.jitter) / h.period) * h.execution for h in higher)
+
+
+def response_time(load, higher):
+    """Worst-case response time of ``load`` below the ``higher`` priority loads.
+
+    Walks the jobs of the level-i busy period so D > T (several pending jobs)
+    is handled, and stops at the first job that misses its deadline: its
+    response time is then returned, which may be below the worst one.
+    Returns ``math.inf`` when the busy period does not end and None when it
+    holds more than ``MAX_BUSY_JOBS`` jobs.
+    """
+    u = sum(h.execution / h.period for h in higher) + load.execution / load.period
+    if u > 1 + EPSILON or (u >= 1 - EPSILON and any(h.jitter > 0 for h in higher)):
+        # With jitter a fully loaded processor never drains the backlog
+        return math.inf
+
+    worst = 0.0
+    w = sum(h.execution for h in higher)
+    for q in range(MAX_BUSY_JOBS):
+        # Job q finishes no earlier than job q - 1 plus its own execution
+        w += load.execution
+        while True:
+            nxt = (q + 1) * load.execution + _interference(w, higher)
+            if nxt <= w + EPSILON:
+                break
+            w = nxt
+        worst = max(worst, w - q * load.period)
+        if worst > load.deadline + EPSILON or w <= (q + 1) * load.period + EPSILON:
+            # A miss settles the verdict; a job done before the next release ends the busy period
+            return worst
+    return None
+
+
+def response_time_analysis(tasks, algo="Rate Monotonic (RM)", server_type="Background",
+                           s_period=1.0, s_budget=0.0):
+    """Exact fixed-priority test for RM (priority by period) or DM (by deadline).
+
+    Mirrors the engine's tie-breaking: equal-priority tasks with equal periods
+    and D <= T run in file order and the server loses ties. Other ties are
+    analysed as mutual interference, which keeps a positive verdict safe but
+    makes a negative one inconclusive.
+    """
+    test = "Response-time analysis"
+    by_deadline = algo == "Deadline Monotonic (DM)"
+    loads = _loads(tasks, server_type, s_period, s_budget)
+    server = next((l for l in loads if l.name == "Server"), None)
+    periodic = [l for l in loads if l is not server]
+    prio = (lambda l: l.deadline) if by_deadline else (lambda l: l.period)
+    server_prio = s_period
+
+    exact = all(t.release == 0 for t in periodic_tasks(tasks)) and server is None
+    worst_task, worst_slack = None, math.inf
+    for i, load in enumerate(periodic):
+        higher = []
+        for j, other in enumerate(periodic):
+            if j == i:
+                continue
+            if prio(other) < prio(load) - EPSILON:
+                higher.append(other)
+            elif abs(prio(other) - prio(load)) <= EPSILON:
+                if (abs(other.period - load.period) > EPSILON
+                        or max(load.deadline, other.deadline) > load.period + EPSILON):
+                    # With D > T an older job of either task runs before a newer one of the other
+                    higher.append(other)
+                    exact = False
+                elif j < i:
+                    higher.append(other)
+        if server is not None and server_prio < prio(load) - EPSILON:
+            higher.append(server)
+
+        r = response_time(load, higher)
+        if r is None:
+            return Verdict(None, test, True, f"busy period of {load.name} too long to analyse")
+        slack = load.deadline - r
+        if slack < worst_slack:
+            worst_task, worst_slack = load.name, slack
+
+    if worst_task is None:
+        return Verdict(True, test, False, "no periodic tasks")
+    if worst_slack >= -EPSILON:
+        return Verdict(True, test, False, f"all R <= D (min slack {worst_slack:.4f} on {worst_task})")
+    if exact:
+        return Verdict(False, test, False, f"{worst_task} misses its deadline (R - D = {-worst_slack:.4f})")
+    return Verdict(None, test, True, f"{worst_task} may miss its deadline (pessimistic bound)")
+
+
+def demand_bound(loads, t):
+    """Processor demand of jobs with both release and deadline inside [0, t]."""
+    demand = 0.0
+    for l in loads:
+        if t + l.jitter >= l.deadline - EPSILON:
+            demand += (_floor((t + l.jitter - l.deadline) / l.period) + 1) * l.execution
+    return demand
+
+
+def processor_demand_test(tasks, server_type="Background", s_period=1.0, s_budget=0.0):
+    """Exact EDF test: U <= 1 and dbf(t) <= t at every deadline up to the L* bound."""
+    test = "Processor demand analysis"
+    loads = _loads(tasks, server_type, s_period, s_budget)
+    if not loads:
+        return Verdict(True, test, False, "no periodic tasks")
+    server = any(l.name == "Server" for l in loads)
+    exact = all(t.release == 0 for t in periodic_tasks(tasks)) and not server
+
+    u = sum(l.execution / l.period for l in loads)
+    if server and server_type == 'TBS' and any(l.deadline < l.period for l in loads):
+        # The TBS demand is only bounded by Us * t, not by a periodic dbf
+        return Verdict(None, test, True, "TBS with D < T")
+    if u > 1 + EPSILON:
+        if server:
+            # The server only consumes its budget when aperiodic work is pending
+            return Verdict(None, test, True, f"U={u:.4f} > 1 including the server")
+        return Verdict(False, test, False, f"U={u:.4f} > 1")
+    if all(l.deadline >= l.period and l.jitter == 0 for l in loads):
+        return Verdict(True, test, False, f"U={u:.4f} <= 1 with D >= T")
+    if u >= 1 - EPSILON and any(l.jitter > 0 for l in loads):
+        return Verdict(None, test, True, f"U={u:.4f} with jitter leaves no finite bound")
+
+    # Synchronous busy period bounds the interval that has to be checked
+    busy = sum(l.execution for l in loads)
+    while True:
+        nxt = sum(_ceil((busy + l.jitter) / l.period) * l.execution for l in loads)
+        if nxt <= busy + EPSILON:
+            break
+        busy = nxt
+    horizon = busy
+    if u < 1 - EPSILON:
+        la = sum((l.period + l.jitter - l.deadline) * l.execution / l.period for l in loads) / (1 - u)
+        horizon = min(horizon, max(la, max(l.deadline for l in loads)))
+
+    points = set()
+    for l in loads:
+        first = l.deadline - l.jitter
+        if first > horizon + EPSILON:
+            continue
+        count = _floor((horizon - first) / l.period) + 1
+        if len(points) + count > MAX_DEMAND_POINTS:
+            return Verdict(None, test, True, "too many deadlines to check")
+        points.update(first + k * l.period for k in range(count))
+
+    for t in sorted(points):
+        if t > 0 and demand_bound(loads, t) > t + EPSILON:
+            if exact:
+                return Verdict(False, test, False, f"dbf({t:g}) > {t:g}")
+            return Verdict(None, test, True, f"dbf({t:g}) > {t:g} (pessimistic bound)")
+    return Verdict(True, test, False, f"dbf(t) <= t up to L={horizon:g}")
+
+
+def precheck(tasks, algo, server_type="Background", s_period=1.0, s_budget=0.0):
+    """Pick the cheapest conclusive test for ``algo``.
+
+    ``needs_simulation`` is also set when aperiodic tasks are present, since
+    their response times are only available from a simulation.
+    """
+    has_aperiodic = any(t.task_type == 'Aperiodic' for t in tasks)
+
+    if utilization(tasks) > 1 + EPSILON:
+        verdict = Verdict(False, "Utilization", False, f"U={utilization(tasks):.4f} > 1")
+    elif algo == "Rate Monotonic (RM)":
+        verdict = None
+        if server_type == 'Background' or not has_aperiodic:
+            for check in (liu_layland_test, hyperbolic_test):
+                verdict = check(tasks)
+                if verdict.schedulable:
+                    break
+            else:
+                verdict = None
+        if verdict is None:
+            verdict = response_time_analysis(tasks, algo, server_type, s_period, s_budget)
+    elif algo == "Deadline Monotonic (DM)":
+        verdict = response_time_analysis(tasks, algo, server_type, s_period, s_budget)
+    elif algo == "Earliest Deadline First (EDF)":
+        verdict = processor_demand_test(tasks, server_type, s_period, s_budget)
+    else:
+        # LLF with hysteresis has no exact test here
+        verdict = Verdict(None, "None", True, f"no analysis for {algo}")
+
+    if has_aperiodic and not verdict.needs_simulation:
+        verdict = verdict._replace(needs_simulation=True)
+    return verdict
@@ -0,0 +1,206 @@
+"""Reproducible benchmarks of the simulation engine.
+
+Example::
+
+    python rts_bench.py --tasks 4 16 64 --horizons 1000 10000 --algos RM EDF LLF \\
+        --profile -o bench.csv
+    python rts_bench.py --baseline bench.csv     # later: speedup per case
+
+Every case generates a task set from a fixed seed (UUniFast utilizations,
+log-uniform periods with one decimal, plus a few aperiodic arrivals spread
+over the horizon) and times ``SimulationEngine.run`` over the whole
+horizon. Runs continue after deadline misses and cycle detection is off by
+default, so the measured work is the event loop itself and does not depend
+on whether a set happens to be schedulable.
+
+Reported per case: wall time (best of ``--repeat``), events (engine steps)
+per second, simulated time per second and ``ticks_per_s``, the rate in
+0.01 quanta of the original fixed-step loop, so numbers stay comparable
+with it. Peak memory is measured with ``tracemalloc`` in a separate run,
+and ``--profile`` adds one more run with per-phase timers (``PHASES``).
+"""
+import argparse
+import csv
+import math
+import random
+import sys
+import time
+import tracemalloc
+
+from rts_cli import resolve_algorithm, resolve_server
+from rts_core import PHASES, POLICIES, SERVER_TYPES, SimulationEngine, Task, server_supported
+
+# Step of the original fixed-quantum simulation loop
+TICK = 0.01
+
+DEFAULT_TASKS = (4, 16, 64)
+DEFAULT_HORIZONS = (1000.0, 10000.0)
+
+BENCH_FIELDS = ("tasks", "horizon", "algorithm", "server", "time_base", "wall_s", "steps", "segments",
+                "events_per_s", "sim_time_per_s", "ticks_per_s", "peak_kib", "deadline_misses")
+
+
+def generate_tasks(seed, tasks, utilization=0.85, tmin=10.0, tmax=1000.0, aperiodic=None, horizon=1000.0):
+    """Deterministic task set: ``tasks`` periodic tasks and ``aperiodic`` arrivals in ``[0, horizon)``."""
+    rng = random.Random(seed)
+    remaining = utilization
+    utils = []
+    for i in range(tasks - 1):
+        following = remaining * rng.random() ** (1.0 / (tasks - 1 - i))
+        utils.append(remaining - following)
+        remaining = following
+    utils.append(remaining)
+
+    task_list = []
+    for i, u in enumerate(utils):
+        period = round(math.exp(rng.uniform(math.log(tmin), math.log(tmax))), 1)
+        execution = max(round(u * period, 2), TICK)
+        task_list.append(Task(f"P{i + 1}", 0.0, execution, period, period, 'Periodic'))
+    if aperiodic is None:
+        aperiodic = max(1, tasks // 4)
+    for i in range(aperiodic):
+        arrival = round(rng.uniform(0, horizon), 1)
+        execution = round(rng.uniform(0.5, 2.0), 1)
+        task_list.append(Task(f"A{i + 1}", arrival, execution, 0.0, 99999.0, 'Aperiodic'))
+    return task_list
+
+
+def bench_cases(tasks, horizons, algos, servers):
+    for n in tasks:
+        for horizon in horizons:
+            for algo in algos:
+                for server in servers:
+                    if server_supported(algo, server):
+                        yield n, horizon, algo, server
+
+
+def _engine(task_list, algo, server, budget, period, detect_cycles, keep_log, profile=False):
+    return SimulationEngine(task_list, algo, server, period, budget, detect_cycles=detect_cycles,
+                            keep_log=keep_log, continue_after_miss=True, profile=profile)
+
+
+def run_case(n, horizon, algo, server, seed=1, budget=1.0, period=5.0, repeat=3, detect_cycles=False,
+             keep_log=True, memory=True, profile=False, **generate_kwargs):
+    """Benchmark one configuration and return a ``BENCH_FIELDS`` record (plus phase columns)."""
+    task_list = generate_tasks(seed, n, horizon=horizon, **generate_kwargs)
+    best = None
+    for _ in range(max(repeat, 1)):
+        engine = _engine(task_list, algo, server, budget, period, detect_cycles, keep_log)
+        start = time.perf_counter()
+        engine.run(horizon)
+        engine.flush_trace()
+        wall = time.perf_counter() - start
+        if best is None or wall < best[0]:
+            best = (wall, engine)
+    wall, engine = best
+
+    record = {
+        "tasks": n,
+        "horizon": horizon,
+        "algorithm": POLICIES[algo].short_name,
+        "server": server,
+        "time_base": engine.time_base,
+        "wall_s": wall,
+        "steps": engine.steps,
+        "segments": len(engine.time_log) if keep_log else None,
+        "events_per_s": engine.steps / wall if wall else None,
+        "sim_time_per_s": horizon / wall if wall else None,
+        "ticks_per_s": horizon / TICK / wall if wall else None,
+        "peak_kib": None,
+        "deadline_misses": engine.deadline_misses,
+    }
+
+    if memory:
+        tracemalloc.start()
+        try:
+            engine = _engine(task_list, algo, server, budget, period, detect_cycles, keep_log)
+            engine.run(horizon)
+            record["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+    if profile:
+        engine = _engine(task_list, algo, server, budget, period, detect_cycles, keep_log, profile=True)
+        engine.run(horizon)
+        for phase in PHASES:
+            record[f"{phase}_s"] = engine.phase_times[phase]
+    return record
+
+
+def load_baseline(path):
+    """Wall times of an earlier benchmark CSV, keyed by case."""
+    with open(path, newline="") as f:
+        return {(int(row["tasks"]), float(row["horizon"]), row["algorithm"], row["server"]): float(row["wall_s"])
+                for row in csv.DictReader(f)}
+
+
+def iter_bench(tasks=DEFAULT_TASKS, horizons=DEFAULT_HORIZONS, algos=None, servers=None, baseline=None,
+               **kwargs):
+    """Yield one record per case; with ``baseline`` (see ``load_baseline``) a ``speedup`` is added."""
+    algos = list(algos or POLICIES)
+    servers = list(servers or SERVER_TYPES)
+    for n, horizon, algo, server in bench_cases(tasks, horizons, algos, servers):
+        record = run_case(n, horizon, algo, server, **kwargs)
+        if baseline is not None:
+            before = baseline.get((n, float(horizon), record["algorithm"], server))
+            record["speedup"] = before / record["wall_s"] if before and record["wall_s"] else None
+        yield record
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="rts_bench", description="Benchmark the simulation engine over generated task sets.")
+    parser.add_argument("-n", "--tasks", nargs="+", type=int, default=DEFAULT_TASKS,
+                        help="periodic tasks per set (default: 4 16 64)")
+    parser.add_argument("-d", "--horizons", nargs="+", type=float, default=DEFAULT_HORIZONS,
+                        help="simulation lengths (default: 1000 10000)")
+    parser.add_argument("--algos", nargs="+", type=resolve_algorithm, help="algorithms (default: all)")
+    parser.add_argument("--servers", nargs="+", type=resolve_server, help="server types (default: all)")
+    parser.add_argument("-u", "--utilization", type=float, default=0.85,
+                        help="periodic utilization of the sets (default: 0.85)")
+    parser.add_argument("-b", "--budget", type=float, default=1.0, help="server budget Cs (default: 1)")
+    parser.add_argument("-p", "--period", type=float, default=5.0, help="server period Ts (default: 5)")
+    parser.add_argument("--seed", type=int, default=1, help="task set seed (default: 1)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="timed runs per case, best is kept (default: 3)")
+    parser.add_argument("--detect-cycles", action="store_true", help="let the engine replicate hyperperiods")
+    parser.add_argument("--stream", action="store_true", help="run with keep_log=False")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--profile", action="store_true", help="add per-phase timings (one extra run)")
+    parser.add_argument("--baseline", help="earlier benchmark CSV to compute speedups against")
+    parser.add_argument("-o", "--output", help="CSV output file (default: stdout)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if min(args.tasks) < 1 or min(args.horizons) <= 0 or not 0 < args.utilization:
+        print("invalid benchmark parameters", file=sys.stderr)
+        return 1
+
+    fields = BENCH_FIELDS
+    if args.profile:
+        fields += tuple(f"{phase}_s" for phase in PHASES)
+    baseline = None
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        fields += ("speedup",)
+
+    records = iter_bench(args.tasks, args.horizons, args.algos, args.servers, baseline,
+                         seed=args.seed, budget=args.budget, period=args.period, repeat=args.repeat,
+                         detect_cycles=args.detect_cycles, keep_log=not args.stream,
+                         memory=not args.no_memory, profile=args.profile, utilization=args.utilization)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=fields)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Memoized simulation results keyed by task set and configuration.
+
+``run_key`` hashes a canonical form of a scheduler's tasks and engine
+options together with the algorithm, server type, Ts, Cs and a hash of the
+``rts_core`` source, so any engine change invalidates old runs. The horizon
+is not part of the key: a ``ResultCache`` keeps the longest run of every
+key, which answers any shorter horizon by cutting its trace at the
+requested instant. Each stored run also carries a pickled checkpoint of its
+engine, so a longer horizon resumes where the cached run stopped instead of
+simulating from 0::
+
+    cache = ResultCache(directory=default_store_dir())
+    result = cache.simulate(scheduler, "Earliest Deadline First (EDF)", "CBS", 5, 1, 1000)
+
+Results live in an LRU bounded by entries, trace segments and checkpoint
+bytes and, with ``directory``, in one file per key there. Disk entries are
+pickles, so ``directory`` must not be writable by anyone you do not trust.
+Callers that only need the outcome (sweeps) pass ``keep_trace=False``: runs
+are then simulated and stored without their trace.
+"""
+import functools
+import hashlib
+import os
+import pickle
+from collections import OrderedDict, namedtuple
+from fractions import Fraction
+
+import rts_core
+from rts_loader import default_cache_dir
+
+# Bump when the key or the stored entries change meaning
+VERSION = 2
+
+# Outcome of one run; times are floats as in SimulationEngine
+SimulationResult = namedtuple("SimulationResult",
+                              "time_log error_info fail_time missed_task deadline_misses aperiodic_responses")
+
+# horizon: instant the run reached; scale: ticks per time unit (None unless the time base is
+# ticks); epsilon: the engine's; traced: whether result.time_log holds the trace;
+# finishes: aperiodic task name -> completion time; checkpoint: pickled engine
+_Entry = namedtuple("_Entry", "horizon scale epsilon traced result finishes checkpoint")
+
+
+@functools.lru_cache(maxsize=None)
+def engine_fingerprint():
+    """Hash of the ``rts_core`` source, so runs and checkpoints of an older engine are not reused."""
+    try:
+        with open(rts_core.__file__, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None     # no source to hash (frozen build): VERSION alone decides
+
+
+def default_store_dir():
+    """``results`` below ``rts_loader.default_cache_dir()``."""
+    return os.path.join(default_cache_dir(), "results")
+
+
+def run_key(scheduler, algo, server_type, s_period, s_budget):
+    """Hex digest identifying a run of ``scheduler.tasks`` under the given configuration."""
+    tasks = tuple((t.name, t.task_type, t.release, t.execution, t.period, t.deadline, t.server)
+                  for t in scheduler.tasks)
+    options = (scheduler.epsilon, scheduler.llf_threshold, scheduler.detect_cycles, scheduler.time_base,
+               scheduler.continue_after_miss)
+    canonical = repr((VERSION, engine_fingerprint(), tasks, options, algo, server_type,
+                      float(s_period), float(s_budget)))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def checkpoint(engine):
+    """Pickled state of ``engine`` without its trace and sinks; flushes the open segment first.
+
+    A hyperperiod still being buffered for cycle detection is left out too:
+    the restored engine starts a fresh comparison at the next boundary.
+    """
+    engine.flush_trace()
+    saved = (engine.time_log, engine.trace_sinks, engine.job_sinks,
+             engine._checkpoint, engine._cycle_segments)
+    engine.time_log, engine.trace_sinks, engine.job_sinks = [], [], []
+    if engine._cycle_start is None:
+        engine._checkpoint = engine._cycle_segments = None
+    try:
+        return pickle.dumps(engine, pickle.HIGHEST_PROTOCOL)
+    finally:
+        (engine.time_log, engine.trace_sinks, engine.job_sinks,
+         engine._checkpoint, engine._cycle_segments) = saved
+
+
+def _cut(log, until, epsilon):
+    """``log`` up to ``until`` as a run stopping there would log it.
+
+    Such a run stretches its last step to ``until`` when the next event is
+    within ``epsilon`` of it, so shorter leftovers are dropped and the last
+    kept segment ends at ``until``.
+    """
+    lo, hi = 0, len(log)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if log[mid][0] < until - epsilon:
+            lo = mid + 1
+        else:
+            hi = mid
+    log = log[:lo]
+    if log:
+        log[-1] = (log[-1][0], until, log[-1][2])
+    return log
+
+
+class ResultCache:
+    """LRU of finished runs, optionally backed by ``directory``.
+
+    At most ``max_entries`` runs, ``max_segments`` trace segments and
+    ``max_bytes`` of engine checkpoints over all of them are held in memory;
+    a larger run is only kept on disk. Without ``keep_trace`` results carry an empty ``time_log``.
+    """
+
+    def __init__(self, directory=None, keep_trace=True, max_entries=256, max_segments=1_000_000,
+                 max_bytes=64 * 2 ** 20):
+        self.directory = directory
+        self.keep_trace = keep_trace
+        self.max_entries = max_entries
+        self.max_segments = max_segments
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> _Entry, least recently used first
+        self._segments = 0
+        self._bytes = 0
+
+    def get(self, key, duration):
+        """The result of simulating ``key`` up to ``duration``, None unless a cached run answers it."""
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        result = entry.result
+        until = self._until(entry, duration)
+        if result.error_info is not None:
+            # The run stopped at its first miss: every longer horizon ends the same way
+            if result.fail_time < until - entry.epsilon:
+                return result
+        elif until > entry.horizon + entry.epsilon:
+            return None
+        elif until >= entry.horizon - entry.epsilon:
+            return result
+        if result.deadline_misses and result.fail_time < until - entry.epsilon:
+            return None     # continue_after_miss: misses before ``until`` are not counted separately
+        tolerance = max(entry.epsilon, 1e-9 * max(1.0, abs(until)))
+        return SimulationResult(_cut(result.time_log, until, entry.epsilon), None, 0.0, None, 0,
+                                {name: response for name, response in result.aperiodic_responses.items()
+                                 if entry.finishes[name] <= until + tolerance})
+
+    def resume(self, key, duration):
+        """Engine restored from the checkpoint of a cached shorter run of ``key``, or None.
+
+        Its ``time_log`` already holds the cached trace (with ``keep_trace``);
+        ``run(duration)`` continues from the instant the cached run reached.
+        """
+        entry = self._entry(key)
+        if (entry is None or entry.result.error_info is not None
+                or entry.horizon >= self._until(entry, duration) - entry.epsilon):
+            return None
+        engine = pickle.loads(entry.checkpoint)
+        engine.time_log = list(entry.result.time_log)
+        engine.keep_log = self.keep_trace
+        engine.cancelled = False
+        return engine
+
+    def store(self, key, engine, time_log=None):
+        """Record the run of ``engine`` under ``key`` and return its ``SimulationResult``.
+
+        ``time_log`` defaults to ``engine.time_log``; the open trace segment
+        is flushed to the engine's sinks first. A run that reached less than the
+        cached one of ``key`` is not stored.
+        """
+        engine.flush_trace()
+        log = []
+        if self.keep_trace:
+            log = engine.time_log if time_log is None else time_log
+        old = self._entry(key)
+        if old is not None and 0 < len(old.result.time_log) < len(log):
+            # A resumed run starts a new segment at the checkpoint; merge it like the engine would
+            n = len(old.result.time_log)
+            last, first = log[n - 1], log[n]
+            if last[2] == first[2] and abs(last[1] - first[0]) <= engine.epsilon:
+                log[n - 1:n + 1] = [(last[0], first[1], last[2])]
+
+        result = SimulationResult(log, engine.error_info, engine.fail_time, engine.missed_task,
+                                  engine.deadline_misses, dict(engine.aperiodic_responses))
+        if old is not None and (old.result.error_info is not None or old.horizon > engine.current_time
+                                or (old.horizon == engine.current_time and engine.error_info is None)):
+            return result
+        releases = {t.name: engine._to_time(t.release) for t in engine.sim_tasks if t.task_type == 'Aperiodic'}
+        finishes = {name: releases[name] + response for name, response in result.aperiodic_responses.items()}
+        scale = engine.time_scale if engine.time_base == "ticks" else None
+        entry = _Entry(engine.current_time, scale, engine.epsilon, self.keep_trace, result, finishes,
+                       checkpoint(engine))
+        self._remember(key, entry)
+        if self.directory:
+            self._write(key, entry)
+        return result
+
+    def simulate(self, scheduler, algo, server_type, s_period, s_budget, duration):
+        """``SimulationResult`` of a ``scheduler`` run, from the cache when possible."""
+        key = run_key(scheduler, algo, server_type, s_period, s_budget)
+        result = self.get(key, duration)
+        if result is not None:
+            return result
+        engine = self.resume(key, duration)
+        if engine is None:
+            engine = scheduler.create_engine(algo, server_type, s_period, s_budget, keep_log=self.keep_trace)
+        engine.run(float(duration))
+        return self.store(key, engine)
+
+    def clear(self):
+        """Forget the entries held in memory; the disk store is left alone."""
+        self._entries.clear()
+        self._segments = self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _until(entry, duration):
+        # The instant a fresh run to ``duration`` would stop at (engines round to whole ticks)
+        if entry.scale is None:
+            return float(duration)
+        return round(Fraction(str(duration)) * entry.scale) / entry.scale
+
+    def _entry(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self.directory:
+            entry = self._read(key)
+            if entry is not None and self.keep_trace and not entry.traced:
+                return None     # stored by a traceless cache sharing the directory
+            if entry is not None:
+                self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._segments -= len(old.result.time_log)
+            self._bytes -= len(old.checkpoint)
+        size = len(entry.result.time_log)
+        if size > self.max_segments or len(entry.checkpoint) > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._segments += size
+        self._bytes += len(entry.checkpoint)
+        while (self._segments > self.max_segments or self._bytes > self.max_bytes
+               or len(self._entries) > self.max_entries):
+            _, evicted = self._entries.popitem(last=False)
+            self._segments -= len(evicted.result.time_log)
+            self._bytes -= len(evicted.checkpoint)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.rres")
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                version, fingerprint, entry = pickle.load(f)
+        except Exception:  # missing, damaged or foreign: just a miss
+            return None
+        if version != VERSION or fingerprint != engine_fingerprint() or not isinstance(entry, _Entry):
+            return None
+        return entry
+
+    def _write(self, key, entry):
+        # Best effort like the parse cache: a failed write only costs a later recomputation
+        path = self._path(key)
+        temp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp, "wb") as f:
+                pickle.dump((VERSION, engine_fingerprint(), entry), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, path)
+        except OSError:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
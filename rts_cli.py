@@ -0,0 +1,231 @@
+"""Headless batch front-end for the scheduling core.
+
+Example::
+
+    python rts_cli.py set1.txt set2.txt --algo EDF --server Deferrable \\
+        --budget 2 --period 5 --duration 100 --format csv -o results.csv
+
+Only the simulation modules are imported, so no display, tkinter or matplotlib
+is needed.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from rts_core import POLICIES, SERVER_TYPES, Scheduler
+from rts_loader import TaskFileError, default_cache_dir, load_tasks
+from rts_multicore import HEURISTICS, MODES
+from rts_trace import TraceWriter
+
+CSV_FIELDS = ("file", "algorithm", "server", "budget", "period", "duration",
+              "feasible", "missed_task", "fail_time", "segments")
+
+
+def resolve_algorithm(value):
+    """Accept a full policy name ("Rate Monotonic (RM)") or its short form ("rm")."""
+    if value in POLICIES:
+        return value
+    for name, policy in POLICIES.items():
+        if policy.short_name and policy.short_name.lower() == value.lower():
+            return name
+    raise argparse.ArgumentTypeError(
+        f"unknown algorithm '{value}' (choose from {', '.join(p.short_name for p in POLICIES.values())})")
+
+
+def resolve_server(value):
+    for name in SERVER_TYPES:
+        if name.lower() == value.lower():
+            return name
+    raise argparse.ArgumentTypeError(
+        f"unknown server type '{value}' (choose from {', '.join(SERVER_TYPES)})")
+
+
+def resolve_mode(value):
+    for name in MODES:
+        if name.lower() == value.lower():
+            return name
+    raise argparse.ArgumentTypeError(f"unknown mode '{value}' (choose from {', '.join(MODES)})")
+
+
+def trace_path(trace_dir, path, taken=()):
+    """``trace_dir/<file>.rtst``, numbered ``<file>-2.rtst``... past the paths in ``taken``."""
+    stem = os.path.join(trace_dir, os.path.splitext(os.path.basename(path))[0])
+    candidate, n = stem + ".rtst", 1
+    while candidate in taken:
+        n += 1
+        candidate = f"{stem}-{n}.rtst"
+    return candidate
+
+
+def simulate_file(path, algo, server_type, budget, period, duration, trace_file=None,
+                  continue_after_miss=False, metrics=False, cores=1, mode="Global", heuristic="first-fit",
+                  cache_dir=None):
+    """Run one task file and return a JSON-serialisable result record.
+
+    With ``trace_file`` the segments are streamed to that binary trace (see
+    ``rts_trace``) instead of being collected, and the record names the file
+    in place of carrying a ``time_log``. ``continue_after_miss`` runs the
+    whole duration and adds ``deadline_misses``; ``metrics`` adds the
+    per-task ``rts_metrics`` summary. With ``cores`` > 1 the set runs on that
+    many processors (see ``rts_multicore``) and the record carries one
+    trace per processor in ``core_logs``. ``cache_dir`` caches the parsed
+    task file (see ``rts_loader``).
+    """
+    scheduler = Scheduler()
+    scheduler.tasks = load_tasks(path, cache_dir)
+    scheduler.continue_after_miss = continue_after_miss
+    scheduler.collect_metrics = metrics
+    if cores > 1:
+        return simulate_multicore_file(scheduler, path, algo, server_type, budget, period, duration,
+                                       cores, mode, heuristic, trace_file, metrics)
+
+    engine = scheduler.create_engine(algo, server_type, period, budget, keep_log=trace_file is None)
+    if trace_file is not None:
+        with TraceWriter(trace_file) as writer:
+            engine.trace_sinks.append(writer)
+            engine.run(duration)
+            engine.flush_trace()
+        trace = {"trace": trace_file, "segments": writer.count}
+    else:
+        engine.run(duration)
+        trace = {"time_log": [[start, end, name] for start, end, name in engine.time_log],
+                 "segments": len(engine.time_log)}
+    record = {
+        "file": path,
+        "algorithm": algo,
+        "server": server_type,
+        "budget": budget,
+        "period": period,
+        "duration": duration,
+        "feasible": engine.error_info is None,
+        "missed_task": engine.missed_task,
+        "fail_time": engine.fail_time if engine.error_info else None,
+        **trace,
+    }
+    if continue_after_miss:
+        record["feasible"] = engine.deadline_misses == 0
+        record["fail_time"] = engine.fail_time if engine.deadline_misses else None
+        record["deadline_misses"] = engine.deadline_misses
+    if metrics:
+        record["metrics"] = engine.metrics.summary()
+    return record
+
+
+def simulate_multicore_file(scheduler, path, algo, server_type, budget, period, duration, cores, mode,
+                            heuristic, trace_file=None, metrics=False):
+    if trace_file is not None or metrics:
+        raise ValueError("trace files and metrics are only available for single-processor runs")
+    result = scheduler.run_multicore(algo, server_type, period, budget, duration, cores, mode, heuristic)
+    record = {
+        "file": path,
+        "algorithm": algo,
+        "server": server_type,
+        "budget": budget,
+        "period": period,
+        "duration": duration,
+        "feasible": result.missed_task is None,
+        "missed_task": result.missed_task,
+        "fail_time": result.fail_time if result.missed_task is not None else None,
+        "cores": cores,
+        "mode": mode,
+        "core_logs": [[[start, end, name] for start, end, name in log] for log in result.core_logs],
+        "segments": sum(len(log) for log in result.core_logs),
+    }
+    if result.assignment is not None:
+        record["assignment"] = result.assignment
+    if scheduler.continue_after_miss:
+        record["deadline_misses"] = result.deadline_misses
+    return record
+
+
+def write_json(results, out):
+    json.dump(results, out)
+    out.write("\n")
+
+
+def write_csv(results, out):
+    """One summary row per run; the full trace is only in the JSON output or trace files."""
+    fields = CSV_FIELDS
+    for extra in ("deadline_misses", "cores", "mode"):
+        if any(extra in record for record in results):
+            fields += (extra,)
+    writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(results)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="rts_cli", description="Run real-time scheduling simulations without the GUI.")
+    parser.add_argument("files", nargs="+", help="task set input files")
+    parser.add_argument("-a", "--algo", type=resolve_algorithm, default="Rate Monotonic (RM)",
+                        help="scheduling algorithm: RM, DM, EDF, LLF or the full name (default: RM)")
+    parser.add_argument("-s", "--server", type=resolve_server, default="Background",
+                        help=f"aperiodic server: {', '.join(SERVER_TYPES)} (default: Background)")
+    parser.add_argument("-b", "--budget", type=float, default=1.0, help="server budget Cs (default: 1)")
+    parser.add_argument("-p", "--period", type=float, default=5.0, help="server period Ts (default: 5)")
+    parser.add_argument("-d", "--duration", type=float, default=20.0, help="simulation length (default: 20)")
+    parser.add_argument("-f", "--format", choices=("json", "csv"), default="json",
+                        help="output format (default: json)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("-t", "--trace-dir",
+                        help="stream each run's segments to DIR/<file>.rtst (<file>-2.rtst... for repeated "
+                             "names) instead of keeping them in memory")
+    parser.add_argument("--continue-after-miss", action="store_true",
+                        help="keep simulating after a deadline miss and count all misses")
+    parser.add_argument("--metrics", action="store_true",
+                        help="add per-task response time, lateness and preemption statistics (JSON)")
+    parser.add_argument("-c", "--cores", type=int, default=1, help="number of processors (default: 1)")
+    parser.add_argument("--mode", type=resolve_mode, default="Global",
+                        help="multiprocessor scheduling: Global or Partitioned (default: Global)")
+    parser.add_argument("--heuristic", choices=tuple(HEURISTICS), default="first-fit",
+                        help="bin packing for partitioned mode, by decreasing utilization (default: first-fit)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always parse the task files instead of using the parse cache")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.cores < 1:
+        print("--cores must be at least 1", file=sys.stderr)
+        return 1
+
+    if args.trace_dir:
+        os.makedirs(args.trace_dir, exist_ok=True)
+
+    results = []
+    failed = False
+    traces = set()      # files with equal names in different directories get their own trace
+    for path in args.files:
+        try:
+            trace_file = None
+            if args.trace_dir:
+                trace_file = trace_path(args.trace_dir, path, traces)
+                traces.add(trace_file)
+            results.append(simulate_file(path, args.algo, args.server, args.budget,
+                                         args.period, args.duration, trace_file,
+                                         args.continue_after_miss, args.metrics, args.cores,
+                                         args.mode, args.heuristic,
+                                         None if args.no_cache else default_cache_dir()))
+        except TaskFileError as e:
+            # Already names the file and line
+            print(e, file=sys.stderr)
+            failed = True
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            failed = True
+
+    writer = write_json if args.format == "json" else write_csv
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            writer(results, out)
+    else:
+        writer(results, sys.stdout)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1247 @@
+import heapq
+import math
+import time
+from collections import deque, namedtuple
+from fractions import Fraction
+from functools import partial
+
+# ==========================================
+# 1. DATA STRUCTURES & LOGIC
+# ==========================================
+
+class Task:
+    def __init__(self, name, release, execution, period, deadline, task_type, server=0):
+        self.name = name
+        self.release = float(release)
+        self.execution = float(execution)
+        self.period = float(period) if period else 0.0
+        self.deadline = float(deadline) if deadline else 0.0
+        self.task_type = task_type
+        self.server = server # Index of the server serving an aperiodic task
+        
+        # Scheduling state management
+        self.next_release = 0.0
+        # Bu değerler artık instance (kopya) üzerinde takip edilecek
+        self.current_job_rem = 0.0
+        self.current_abs_deadline = 0.0
+        self.instance_id = 0 # Görselleştirmede karışıklığı önlemek için
+        self.seq = 0 # Global release order, breaks priority ties
+        self.start_time = None # First instant the (aperiodic) job ran
+        self.preemptions = 0
+
+class Job:
+    """One released instance of a periodic task.
+
+    Only the per-instance state is stored; the static parameters are read
+    through ``task``. Finished jobs are handed back to their ``JobPool`` and
+    reused for later releases, so the release loop does not allocate.
+    """
+
+    __slots__ = ("task", "current_job_rem", "current_abs_deadline", "instance_id", "seq",
+                 "release_time", "start_time", "preemptions")
+
+    task_type = 'Periodic'
+
+    @property
+    def name(self):
+        return self.task.name
+
+    @property
+    def release(self):
+        return self.task.release
+
+    @property
+    def execution(self):
+        return self.task.execution
+
+    @property
+    def period(self):
+        return self.task.period
+
+    @property
+    def deadline(self):
+        return self.task.deadline
+
+
+class JobPool:
+    """Free list of ``Job`` records."""
+
+    def __init__(self):
+        self._free = []
+
+    def acquire(self, task, release, abs_deadline, seq):
+        job = self._free.pop() if self._free else Job()
+        job.task = task
+        job.current_job_rem = task.execution
+        job.current_abs_deadline = abs_deadline
+        job.instance_id = task.instance_id
+        job.seq = seq
+        job.release_time = release
+        job.start_time = None
+        job.preemptions = 0
+        return job
+
+    def recycle(self, job):
+        job.current_job_rem = 0
+        self._free.append(job)
+
+    def __len__(self):
+        return len(self._free)
+
+
+class ReadyQueue:
+    """Binary heap of ready jobs ordered by a policy key.
+
+    Jobs are ordered by ``(policy.key(job), job.seq)`` so equal priorities fall
+    back to release order. Removal is lazy: the heap entry is only marked and
+    skipped once it reaches the top, which keeps push/pop/discard O(log n).
+    """
+
+    _REMOVED = None
+
+    def __init__(self, policy):
+        self.policy = policy
+        self._heap = []
+        self._entries = {}  # job seq -> heap entry
+
+    def push(self, job):
+        entry = [self.policy.key(job), job.seq, job]
+        self._entries[job.seq] = entry
+        heapq.heappush(self._heap, entry)
+
+    def discard(self, job):
+        entry = self._entries.pop(job.seq, None)
+        if entry is not None:
+            entry[2] = self._REMOVED
+
+    def update(self, job):
+        """Re-key ``job`` after its key changed; iteration order is kept."""
+        entry = self._entries.get(job.seq)
+        if entry is None:
+            return
+        key = self.policy.key(job)
+        if entry[0] == key:
+            return
+        entry[2] = self._REMOVED
+        entry = [key, job.seq, job]
+        self._entries[job.seq] = entry  # existing key, so the dict order is unchanged
+        heapq.heappush(self._heap, entry)
+
+    def peek(self):
+        heap = self._heap
+        while heap and heap[0][2] is self._REMOVED:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def peek_tied(self, tolerance):
+        """Earliest-released job whose key is within ``tolerance`` of the top.
+
+        Only the heap entries within the tolerance are visited, so float
+        near-ties break by release order instead of by rounding noise.
+        """
+        top = self.peek()
+        if top is None or not tolerance:
+            return top
+        heap = self._heap
+        limit = heap[0][0] + tolerance
+        best = top
+        stack = [0]
+        while stack:
+            i = stack.pop()
+            if i >= len(heap) or heap[i][0] > limit:
+                continue
+            job = heap[i][2]
+            if job is not self._REMOVED and job.seq < best.seq:
+                best = job
+            stack.extend((2 * i + 1, 2 * i + 2))
+        return best
+
+    def smallest(self, n):
+        """The ``n`` most urgent jobs, most urgent first."""
+        return [entry[2] for entry in heapq.nsmallest(n, self._entries.values())]
+
+    def peek_second(self):
+        """The job that would be on top if ``peek()`` were removed."""
+        if self.peek() is None:
+            return None
+        top = heapq.heappop(self._heap)
+        second = self.peek()
+        heapq.heappush(self._heap, top)
+        return second
+
+    def pop(self):
+        job = self.peek()
+        if job is not None:
+            heapq.heappop(self._heap)
+            del self._entries[job.seq]
+        return job
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return (entry[2] for entry in self._entries.values())
+
+
+POLICIES = {}
+
+
+def register_policy(cls):
+    """Class decorator making a policy selectable by its ``name``."""
+    POLICIES[cls.name] = cls
+    return cls
+
+
+class SchedulingPolicy:
+    """Priority rule used by the engine to pick the next job.
+
+    ``key`` maps a job (or the server pseudo-job) to its priority, lower is
+    more urgent. It must stay constant while the job waits in the ready
+    queue. Policies whose priorities move with time override ``select``.
+    ``deadline_driven`` policies rank by absolute deadlines, which the
+    bandwidth servers (TBS, CBS) rely on.
+    """
+
+    name = None
+    short_name = None
+    deadline_driven = False
+
+    def key(self, job):
+        raise NotImplementedError
+
+    def select(self, engine, now, server_ready):
+        """Return ``(task, server_active, crossing)`` for the instant ``now``."""
+        best = engine.ready_queue.peek()
+        if server_ready:
+            # The server loses ties against periodic jobs
+            if best is None or self.key(engine.server_job) < self.key(best) - engine.epsilon:
+                return engine.active_server.queue[0], True, None
+        return best, False, None
+
+
+@register_policy
+class RateMonotonic(SchedulingPolicy):
+    # RM: Static Priority based on Period
+    name = "Rate Monotonic (RM)"
+    short_name = "RM"
+
+    def key(self, job):
+        return job.period
+
+
+@register_policy
+class DeadlineMonotonic(SchedulingPolicy):
+    # DM: Static Priority based on Relative Deadline
+    name = "Deadline Monotonic (DM)"
+    short_name = "DM"
+
+    def key(self, job):
+        return job.deadline
+
+
+@register_policy
+class EarliestDeadlineFirst(SchedulingPolicy):
+    # EDF: Dynamic Priority based on Absolute Deadline
+    name = "Earliest Deadline First (EDF)"
+    short_name = "EDF"
+    deadline_driven = True
+
+    def key(self, job):
+        return job.current_abs_deadline
+
+
+@register_policy
+class LeastLaxityFirst(SchedulingPolicy):
+    """LLF with ``llf_threshold`` hysteresis against the running job.
+
+    A waiting job's laxity ``d - now - rem`` falls at unit rate, so its
+    zero-laxity instant ``d - rem`` is constant and serves as heap key: the
+    least-laxity job is the top of the ready queue. Only the job that ran
+    in the previous step has a stale key, and it is re-keyed on entry.
+    The running job's laxity stays constant, so the instant another
+    candidate overtakes it by ``llf_threshold`` follows from the top two
+    heap entries; it is returned as the crossing time and nothing is
+    rescanned before then. Each decision costs O(log n); with a float
+    time base, near-ties within ``epsilon`` go to the earliest release.
+    """
+
+    name = "Least Laxity First (LLF)"
+    short_name = "LLF"
+    deadline_driven = True
+
+    def key(self, job):
+        # Zero-laxity instant; only meaningful while the job is waiting
+        return job.current_abs_deadline - job.current_job_rem
+
+    def select(self, engine, now, server_ready):
+        eps = engine.epsilon
+        threshold = engine.llf_threshold
+        queue = engine.ready_queue
+        previous = engine.previous_selected_task
+        if previous is not None:
+            queue.update(previous)
+
+        def get_laxity(tsk):
+            return tsk.current_abs_deadline - now - tsk.current_job_rem
+
+        best = queue.peek_tied(eps)
+        best_laxity = get_laxity(best) if best is not None else None
+        server_laxity = get_laxity(engine.server_job) if server_ready else None
+        if server_ready and (best is None or server_laxity < best_laxity - eps):
+            best, best_laxity = None, server_laxity
+
+        selected = best
+        if previous is not None and previous.current_job_rem > eps:
+            # Hysteresis: keep the running job until another candidate's
+            # laxity drops llf_threshold below it.
+            if get_laxity(previous) - best_laxity < threshold - eps:
+                selected = previous
+
+        # The least-laxity job that is not running decides the next switch
+        rival = queue.peek()
+        if selected is None:
+            margin = get_laxity(rival) - server_laxity if rival is not None else None
+        else:
+            if rival is selected:
+                rival = queue.peek_second()
+            sel_laxity = get_laxity(selected)
+            margin = get_laxity(rival) - sel_laxity + threshold if rival is not None else None
+            if server_ready:
+                server_margin = server_laxity - sel_laxity + threshold
+                margin = server_margin if margin is None else min(margin, server_margin)
+        crossing = now + max(margin, 0) if margin is not None else None
+
+        if selected is None:
+            return engine.active_server.queue[0], True, crossing
+        return selected, False, crossing
+
+
+ALGORITHMS = tuple(POLICIES)
+
+# Completed job as handed to SimulationEngine.job_sinks; times are floats.
+# lateness is finish - absolute deadline (None for aperiodic jobs).
+JobRecord = namedtuple("JobRecord", "name instance task_type release start finish response lateness preemptions")
+
+SERVERS = {}
+
+
+def register_server(cls):
+    """Class decorator making a server selectable by its ``name``."""
+    SERVERS[cls.name] = cls
+    return cls
+
+
+class AperiodicServer:
+    """Service of the aperiodic tasks routed to one server instance.
+
+    Every server owns the FIFO ``queue`` of its pending aperiodic tasks and
+    a stand-in ``job`` through which policies rank it against periodic jobs;
+    ``refresh`` updates the job's deadline and remaining work before every
+    decision. Budget refills are timed events: a server books them with
+    ``engine.schedule_replenishment`` and ``replenish`` is called once they
+    are due, so nothing is done for a server between its events. Times are
+    in the engine's internal units.
+    """
+
+    name = None
+    background = False          # served only while no periodic job is ready
+    deadline_driven = False     # needs a deadline-driven policy (EDF, LLF)
+
+    def __init__(self, engine, index, period, budget, job):
+        self.engine = engine
+        self.index = index
+        self.period = period
+        self.budget = budget
+        self.current_budget = budget
+        self.deadline = period
+        self.job = job
+        self.queue = deque()
+
+    def ready(self):
+        return bool(self.queue) and self.current_budget > self.engine.epsilon
+
+    def arrive(self, task, now):
+        self.queue.append(task)
+
+    def replenish(self, at, amount):
+        pass
+
+    def refresh(self):
+        self.job.current_abs_deadline = self.deadline
+        self.job.current_job_rem = self.current_budget
+
+    def consume(self, now, elapsed):
+        """Charge ``elapsed`` of service ending at ``now``; finished tasks are already dequeued."""
+        self.current_budget -= elapsed
+
+    def state(self, now, q):
+        """Cycle-detection state relative to ``now``, quantized by ``q``."""
+        return (tuple((t.name, q(t.current_job_rem)) for t in self.queue),
+                q(self.current_budget), q(self.deadline - now))
+
+
+@register_server
+class BackgroundServer(AperiodicServer):
+    # Aperiodic tasks only use the idle time left by periodic jobs
+    name = "Background"
+    background = True
+
+    def __init__(self, engine, index, period, budget, job):
+        super().__init__(engine, index, period, budget, job)
+        self.current_budget = 0
+
+    def ready(self):
+        return False
+
+    def state(self, now, q):
+        return (tuple((t.name, q(t.current_job_rem)) for t in self.queue),)
+
+
+class PeriodicServer(AperiodicServer):
+    """Budget restored to Cs at every multiple of the period Ts."""
+
+    def __init__(self, engine, index, period, budget, job):
+        super().__init__(engine, index, period, budget, job)
+        self.replenishments = 1
+        engine.schedule_replenishment(self, period)
+
+    def replenish(self, at, amount):
+        self.current_budget = self.budget
+        self.deadline = at + self.period
+        self.replenishments += 1
+        # k * Ts instead of repeated addition keeps replenishments drift-free
+        self.engine.schedule_replenishment(self, self.replenishments * self.period)
+
+
+@register_server
+class PollingServer(PeriodicServer):
+    # Poller: the budget is dropped when nothing is pending at replenishment
+    name = "Poller"
+
+    def replenish(self, at, amount):
+        super().replenish(at, amount)
+        if not self.queue:
+            self.current_budget = 0
+
+
+@register_server
+class DeferrableServer(PeriodicServer):
+    # Deferrable: the budget is preserved until used or replenished
+    name = "Deferrable"
+
+
+@register_server
+class SporadicServer(AperiodicServer):
+    """Sporadic server (Sprunt, Sha & Lehoczky).
+
+    The server becomes active once it has pending work and budget. The
+    budget consumed from then on returns as one chunk a period after the
+    activation, booked when the server goes idle or runs out of budget;
+    several chunks may be pending. A chunk returning while the server is
+    active closes the running activation and starts a new one, otherwise
+    budget consumed after the chunk's return would come back too early.
+    Under EDF the server's deadline is the activation time plus Ts.
+    """
+
+    name = "Sporadic"
+
+    def __init__(self, engine, index, period, budget, job):
+        super().__init__(engine, index, period, budget, job)
+        self.active_since = None
+        self.consumed = 0
+
+    def _activate(self, now):
+        if self.active_since is None and self.queue and self.current_budget > self.engine.epsilon:
+            self.active_since = now
+            self.deadline = now + self.period
+
+    def arrive(self, task, now):
+        super().arrive(task, now)
+        self._activate(now)
+
+    def _deactivate(self):
+        if self.consumed > self.engine.epsilon:
+            self.engine.schedule_replenishment(self, self.active_since + self.period, self.consumed)
+        self.active_since = None
+        self.consumed = 0
+
+    def replenish(self, at, amount):
+        if self.active_since is not None:
+            self._deactivate()
+        self.current_budget += amount
+        self._activate(at)
+
+    def consume(self, now, elapsed):
+        self.current_budget -= elapsed
+        self.consumed += elapsed
+        if not self.queue or self.current_budget <= self.engine.epsilon:
+            self._deactivate()
+
+    def state(self, now, q):
+        active = q(self.active_since - now) if self.active_since is not None else None
+        return super().state(now, q) + (active, q(self.consumed))
+
+
+class BandwidthServer(AperiodicServer):
+    """Server reserving the bandwidth Us = Cs / Ts under a deadline-driven policy."""
+
+    deadline_driven = True
+
+    def __init__(self, engine, index, period, budget, job):
+        super().__init__(engine, index, period, budget, job)
+        if budget <= 0:
+            raise ValueError(f"The {self.name} server needs a positive budget.")
+        self.deadline = 0
+        self._exact = engine.time_base != "float"
+
+    def _span(self, execution):
+        """Time the reserved bandwidth needs to serve ``execution``."""
+        if self._exact:
+            return Fraction(execution * self.period) / self.budget
+        return execution * self.period / self.budget
+
+    def state(self, now, q):
+        # No arrival follows the first checkpoint and pending ones are part of the engine
+        # state, so an idle server cannot matter any more
+        return super().state(now, q) if self.queue else ()
+
+
+@register_server
+class TotalBandwidthServer(BandwidthServer):
+    """Total Bandwidth Server (Spuri & Buttazzo).
+
+    The k-th arrival gets the deadline ``max(r_k, d_k-1) + C_k / Us`` and the
+    queue head runs as an EDF job with that deadline; there is no budget
+    to exhaust, so no replenishment events either.
+    """
+
+    name = "TBS"
+
+    def arrive(self, task, now):
+        super().arrive(task, now)
+        self.deadline = max(task.release, self.deadline) + self._span(task.execution)
+        task.current_abs_deadline = self.deadline
+
+    def ready(self):
+        return bool(self.queue)
+
+    def refresh(self):
+        head = self.queue[0]
+        self.current_budget = head.current_job_rem
+        self.job.current_abs_deadline = head.current_abs_deadline
+        self.job.current_job_rem = head.current_job_rem
+
+    def state(self, now, q):
+        if not self.queue:
+            return ()
+        return (tuple((t.name, q(t.current_job_rem), q(t.current_abs_deadline - now)) for t in self.queue),
+                q(self.deadline - now))
+
+
+@register_server
+class ConstantBandwidthServer(BandwidthServer):
+    """Constant Bandwidth Server (Abeni & Buttazzo).
+
+    An arrival at an idle server keeps the current deadline only if the
+    remaining budget fits the bandwidth before it (``cs <= (ds - r) * Us``),
+    otherwise the server restarts with ``ds = r + Ts`` and a full budget.
+    An exhausted budget is recharged at once and the deadline postponed by
+    Ts, so the server never waits for a replenishment.
+    """
+
+    name = "CBS"
+
+    def arrive(self, task, now):
+        idle = not self.queue
+        super().arrive(task, now)
+        if idle and self.current_budget * self.period >= (self.deadline - now) * self.budget:
+            self.deadline = now + self.period
+            self.current_budget = self.budget
+
+    def ready(self):
+        return bool(self.queue)
+
+    def consume(self, now, elapsed):
+        self.current_budget -= elapsed
+        if self.current_budget <= self.engine.epsilon:
+            self.current_budget = self.budget
+            self.deadline += self.period
+
+
+SERVER_TYPES = tuple(SERVERS)
+
+
+def server_supported(algo, server_type):
+    """Whether ``server_type`` can be combined with the policy ``algo``."""
+    return not SERVERS[server_type].deadline_driven or POLICIES[algo].deadline_driven
+
+# Phases timed by SimulationEngine(profile=True), in the order of one step;
+# "cycle" covers hyperperiod checkpoints and the replay of a detected cycle.
+PHASES = ("deadlines", "arrivals", "replenishment", "select", "next_event", "execute", "log", "cycle")
+
+
+def hyperperiod(periods):
+    """Least common multiple of ``periods``, exact for decimal values.
+
+    Periods are read as the decimals they were written as (0.1 -> 1/10), so
+    LCM(0.3, 0.7) is 2.1. Returns ``None`` when no positive period is given.
+    """
+    lcm = None
+    for period in periods:
+        frac = Fraction(str(period))
+        if frac <= 0:
+            continue
+        if lcm is None:
+            lcm = frac
+        else:
+            # lcm(a/b, c/d) = lcm(a, c) / gcd(b, d) for reduced fractions
+            lcm = Fraction(math.lcm(lcm.numerator, frac.numerator),
+                           math.gcd(lcm.denominator, frac.denominator))
+    return lcm
+
+
+TIME_BASES = ("auto", "ticks", "fraction", "float")
+
+# 'auto' falls back to floats when the input needs a finer tick than this
+MAX_TICK_SCALE = 10 ** 6
+
+# Cycle detection gives up on hyperperiods holding more segments than this
+MAX_CYCLE_SEGMENTS = 50000
+
+
+def tick_scale(values):
+    """Smallest integer scale that turns every decimal in ``values`` into a whole number."""
+    scale = 1
+    for value in values:
+        scale = math.lcm(scale, Fraction(str(value)).denominator)
+    return scale
+
+
+def _to_ticks(scale, value):
+    return round(Fraction(str(value)) * scale)
+
+
+def _from_ticks(scale, value):
+    # Bandwidth server deadlines can make instants Fractions; reports are floats
+    return float(value / scale)
+
+
+def _to_fraction(value):
+    return Fraction(str(value))
+
+
+class SimulationEngine:
+    """Discrete-event simulation of one scheduler run.
+
+    Instead of advancing a fixed quantum, the engine jumps straight to the
+    next instant where the schedule can change: a periodic release, an
+    aperiodic arrival, a server replenishment, the completion of the running
+    job (or exhaustion of the server budget), a pending absolute deadline, an
+    LLF laxity crossing, or the end of the horizon.
+
+    Once every release offset and aperiodic arrival is behind it, the engine
+    compares its state at consecutive hyperperiod boundaries. When the state
+    recurs the schedule is periodic from then on, so the rest of the horizon
+    is filled by replicating the last hyperperiod of ``time_log``.
+
+    ``time_base`` selects how instants are represented internally:
+
+    * ``'ticks'``: integers, scaled by the finest decimal in the task set,
+      server parameters and LLF threshold (0.25 and 0.1 give 1/20 ticks),
+    * ``'fraction'``: exact ``Fraction`` values,
+    * ``'float'``: floats compared with ``epsilon``,
+    * ``'auto'``: ticks unless the scale would exceed ``MAX_TICK_SCALE``.
+
+    Exact bases compare without tolerance. ``sim_tasks``, ``now`` and the
+    servers use internal units; ``time_log``, ``fail_time`` and
+    ``aperiodic_responses`` are always reported as floats.
+
+    Segments can also be consumed while the run is in progress: every
+    callable in ``trace_sinks`` receives each ``(start, end, name)`` segment
+    once it can no longer be extended, and ``stream`` yields them.  With
+    ``keep_log=False`` nothing is accumulated in ``time_log``, so arbitrarily
+    long horizons run in constant memory: cycle detection buffers one
+    hyperperiod, and stops when that ends after ``until`` or holds more than
+    ``MAX_CYCLE_SEGMENTS`` segments.
+
+    Aperiodic tasks are served by ``server_type`` (see ``SERVERS``) and by
+    any further ``(server_type, s_period, s_budget)`` instances in
+    ``extra_servers``; ``Task.server`` indexes ``servers`` (0 being the
+    first). Budget replenishments of all servers share one event heap.
+
+    By default the run stops at the first deadline miss. With
+    ``continue_after_miss`` the late job keeps running, every miss is counted
+    in ``deadline_misses`` and ``missed_task``/``fail_time`` describe the
+    first one, while ``error_info`` stays ``None``. Every completed job is
+    passed to the callables in ``job_sinks`` as a ``JobRecord``;
+    ``metrics=True`` installs an ``rts_metrics.MetricsCollector`` there as
+    ``self.metrics``. Cycle replication produces no jobs and counts no
+    misses, so it is switched off while ``job_sinks`` is non-empty and for
+    a repeating schedule that misses deadlines.
+
+    ``steps`` counts the events processed. With ``profile=True`` the wall
+    time spent in every phase of a step is accumulated in ``phase_times``
+    (seconds per ``PHASES`` entry); without it the timers cost nothing.
+    """
+
+    def __init__(self, tasks, algo, server_type, s_period, s_budget, epsilon=1e-5, llf_threshold=0.1,
+                 detect_cycles=True, time_base="auto", keep_log=True, continue_after_miss=False,
+                 metrics=False, profile=False, extra_servers=()):
+        if isinstance(algo, SchedulingPolicy):
+            self.policy = algo
+        elif algo in POLICIES:
+            self.policy = POLICIES[algo]()
+        else:
+            raise ValueError(f"Unknown scheduling algorithm: {algo}")
+        server_specs = [(server_type, s_period, s_budget)] + [tuple(spec) for spec in extra_servers]
+        for spec_type, spec_period, _ in server_specs:
+            if spec_type not in SERVER_TYPES:
+                raise ValueError(f"Unknown server type: {spec_type}")
+            if spec_type != 'Background' and float(spec_period) <= 0:
+                raise ValueError("Server period must be positive.")
+            if SERVERS[spec_type].deadline_driven and not self.policy.deadline_driven:
+                raise ValueError(f"The {spec_type} server needs a deadline-driven algorithm (EDF or LLF).")
+
+        self.algo = self.policy.name
+        self.server_type = server_type
+
+        # --- Time base ---
+        if time_base not in TIME_BASES:
+            raise ValueError(f"Unknown time base: {time_base}")
+        values = [llf_threshold]
+        for _, spec_period, spec_budget in server_specs:
+            values.extend((spec_period, spec_budget))
+        for t in tasks:
+            values.extend((t.release, t.execution, t.period, t.deadline))
+        scale = tick_scale(values) if time_base in ("auto", "ticks") else 1
+        if time_base == "auto":
+            time_base = "ticks" if scale <= MAX_TICK_SCALE else "float"
+        self.time_base = time_base
+        self.time_scale = scale if time_base == "ticks" else 1
+        # Module-level converters keep the engine picklable (see rts_cache checkpoints)
+        if time_base == "ticks":
+            self._to_base = partial(_to_ticks, scale)
+            self._to_time = partial(_from_ticks, scale)
+        elif time_base == "fraction":
+            self._to_base = _to_fraction
+            self._to_time = float
+        else:
+            self._to_base = float
+            self._to_time = float
+        to_base = self._to_base
+        self.epsilon = epsilon if time_base == "float" else 0
+        self.llf_threshold = to_base(llf_threshold)
+
+        # --- Aperiodic servers; aperiodic tasks go to the one their ``server`` index names ---
+        self._replenishments = []        # (time, booking order, server index, amount) heap of budget refills
+        self._bookings = 0
+        self.servers = []
+        for index, (spec_type, spec_period, spec_budget) in enumerate(server_specs):
+            # Stand-in job through which policies rank the server against periodic jobs
+            job = self._make_task("Server", 0, spec_budget, spec_period, spec_period, 'Server')
+            job.seq = float('inf')
+            self.servers.append(SERVERS[spec_type](self, index, to_base(spec_period), to_base(spec_budget), job))
+        self.server = self.servers[0]
+        self.server_job = self.server.job
+        self.active_server = None        # server chosen by the last decision, if any
+        self._foreground = [server for server in self.servers if not server.background]
+        self._background = [server for server in self.servers if server.background]
+
+        # Task tanımlarını hazırla
+        self.sim_tasks = []
+        self._releases = []   # (next_release, task index) heap of periodic tasks
+        self._arrivals = []   # aperiodic tasks sorted by arrival time
+        for t in tasks:
+            new_t = self._make_task(t.name, t.release, t.execution, t.period, t.deadline, t.task_type)
+            new_t.next_release = new_t.release
+            if new_t.task_type == 'Aperiodic':
+                if not 0 <= t.server < len(self.servers):
+                    raise ValueError(f"Task {t.name}: no server {t.server}")
+                new_t.server = t.server
+            if new_t.task_type == 'Periodic':
+                self._releases.append((new_t.next_release, len(self.sim_tasks)))
+            elif new_t.task_type == 'Aperiodic':
+                self._arrivals.append(new_t)
+            self.sim_tasks.append(new_t)
+        heapq.heapify(self._releases)
+        self._arrivals.sort(key=lambda t: t.release)
+        self._next_arrival = 0
+
+        self.job_pool = JobPool()
+        self.ready_queue = ReadyQueue(self.policy)  # released, unfinished periodic jobs
+        self.aperiodic_queue = self.server.queue  # pending aperiodic tasks of the first server
+        self._deadlines = []             # (absolute deadline, seq, job) heap, lazily pruned
+        self._seq = 0
+
+        self.now = 0
+        self.previous_selected_task = None
+        self.time_log = []
+        self.keep_log = keep_log
+        self.trace_sinks = []            # callables receiving every closed segment
+        self.cancelled = False
+        self._open = None                # [start, end, name] still being extended, internal units
+        self.error_info = None
+        self.fail_time = 0.0
+        self.missed_task = None
+        self.aperiodic_responses = {}    # aperiodic task name -> response time
+        self.continue_after_miss = continue_after_miss
+        self.deadline_misses = 0
+        self.job_sinks = []              # callables receiving a JobRecord per completed job
+        self.metrics = None
+        if metrics:
+            from rts_metrics import MetricsCollector
+            self.metrics = MetricsCollector()
+            self.job_sinks.append(self.metrics)
+        self._running = None             # unfinished job that ran in the previous step
+        self.steps = 0
+        self.phase_times = dict.fromkeys(PHASES, 0.0) if profile else None
+
+        # --- Hyperperiod / cycle detection ---
+        periods = [t.period for t in self.sim_tasks if t.task_type == 'Periodic']
+        periods.extend(server.period for server in self._foreground)
+        hyper = hyperperiod(periods) if periods else None
+        self._hyperperiod = None
+        if hyper is not None:
+            self._hyperperiod = float(hyper) if time_base == "float" else (
+                int(hyper) if time_base == "ticks" else hyper)
+        self.hyperperiod = self._to_time(self._hyperperiod) if hyper is not None else None
+        self.cycle_start = None          # set once the schedule is known to repeat
+        self._cycle_start = None
+        self._cycle_segments = None      # internal-unit segments of the last hyperperiod
+        self._checkpoint = None          # (state, time, deadline misses) at the previous boundary
+        self._next_checkpoint = None
+        if detect_cycles and self._hyperperiod:
+            settle = max([t.release for t in self.sim_tasks] + [0])
+            if self.epsilon:
+                cycles = math.ceil(settle / self._hyperperiod - self.epsilon)
+            else:
+                cycles = -(-settle // self._hyperperiod)
+            self._next_checkpoint = cycles * self._hyperperiod
+
+    def _make_task(self, name, release, execution, period, deadline, task_type):
+        t = Task(name, release, execution, period, deadline, task_type)
+        to_base = self._to_base
+        t.release = to_base(release)
+        t.execution = to_base(execution)
+        t.period = to_base(period) if period else 0
+        t.deadline = to_base(deadline) if deadline else 0
+        return t
+
+    @property
+    def current_time(self):
+        return self._to_time(self.now)
+
+    def run(self, until):
+        """Advance the simulation up to ``until`` or the first deadline miss.
+
+        ``until`` is in time units; with ``'ticks'`` it is rounded to the
+        nearest tick. ``run`` may be called again with a later ``until`` to
+        continue, and returns early once ``cancel`` has been called.
+        """
+        until = self._to_base(until)
+        while self._advance(until):
+            pass
+        return self.time_log, self.error_info, self.fail_time
+
+    def stream(self, until):
+        """Run like ``run`` and yield ``(start, end, name)`` segments as they close.
+
+        The last segment is flushed once ``until`` or a deadline miss is
+        reached, so the yielded sequence equals what ``time_log`` holds.
+        """
+        until = self._to_base(until)
+        pending = deque()
+        sink = pending.append
+        self.trace_sinks.append(sink)
+        try:
+            while self._advance(until):
+                while pending:
+                    yield pending.popleft()
+            self.flush_trace()
+            while pending:
+                yield pending.popleft()
+        finally:
+            self.trace_sinks.remove(sink)
+
+    def flush_trace(self):
+        """Hand the still-open last segment to ``trace_sinks``.
+
+        Call it once the run is over; a segment logged afterwards starts a
+        new one even if it is contiguous with the flushed segment.
+        """
+        if self._open is not None:
+            self._emit(self._open)
+            self._open = None
+
+    def cancel(self):
+        """Stop ``run``/``stream`` at the next step; safe to call from another thread."""
+        self.cancelled = True
+
+    def _advance(self, until):
+        """Take one step towards ``until``; False once there is nothing left to do."""
+        if self.error_info is not None or self.cancelled or self.now >= until - self.epsilon:
+            return False
+        if self._cycle_start is not None:
+            mark = time.perf_counter() if self.phase_times is not None else None
+            self._extend_cycle(until)
+        elif self._next_checkpoint is not None and self.now >= self._next_checkpoint - self.epsilon:
+            mark = time.perf_counter() if self.phase_times is not None else None
+            self._check_cycle(until)
+        else:
+            self._step(until)
+            return True
+        if mark is not None:
+            self._lap("cycle", mark)
+        return True
+
+    def _lap(self, phase, mark):
+        """Charge the time since ``mark`` to ``phase``; returns the new mark."""
+        now = time.perf_counter()
+        self.phase_times[phase] += now - mark
+        return now
+
+    def _cycle_state(self):
+        """Engine state relative to ``now`` (rounded to ``epsilon`` for floats)."""
+        now = self.now
+        q = (lambda value: round(value / self.epsilon)) if self.epsilon else (lambda value: value)
+        jobs = list(self.ready_queue)  # release order
+        previous = self.previous_selected_task
+        return (
+            tuple((job.name, q(job.current_job_rem), q(job.current_abs_deadline - now)) for job in jobs),
+            jobs.index(previous) if previous is not None and previous in jobs else None,
+            tuple(sorted((idx, q(release - now)) for release, idx in self._releases)),
+            tuple(server.state(now, q) for server in self.servers),
+            tuple(sorted((idx, q(at - now), q(amount) if amount is not None else None)
+                         for at, _, idx, amount in self._replenishments)),
+            # The first checkpoint can fall on the last arrival before it is released
+            len(self._arrivals) - self._next_arrival,
+        )
+
+    def _check_cycle(self, until):
+        if self.job_sinks:
+            self._next_checkpoint = None
+            return
+        state = self._cycle_state()
+        if self._checkpoint is not None and self._checkpoint[0] == state:
+            if self.deadline_misses != self._checkpoint[2]:
+                # Replay would not count the misses of every cycle (continue_after_miss)
+                self._next_checkpoint = None
+                return
+            self._cycle_start = self._checkpoint[1]
+            self.cycle_start = self._to_time(self._cycle_start)
+        elif self.now + self._hyperperiod > until + self.epsilon:
+            # The run ends before the buffered hyperperiod could be compared
+            self._stop_cycle_detection()
+        else:
+            self._checkpoint = (state, self.now, self.deadline_misses)
+            self._next_checkpoint = self.now + self._hyperperiod
+            self._cycle_segments = []
+
+    def _stop_cycle_detection(self):
+        self._checkpoint = self._next_checkpoint = self._cycle_segments = None
+
+    def _extend_cycle(self, until):
+        """Replay the repeating hyperperiod from ``now`` to its end (or ``until``)."""
+        hyper = self._hyperperiod
+        if self.epsilon:
+            m = math.floor((self.now - self._cycle_start) / hyper + self.epsilon)
+        else:
+            m = (self.now - self._cycle_start) // hyper
+        shift = m * hyper
+        stop = min(self._cycle_start + shift + hyper, until)
+        for start, end, name in self._cycle_segments:
+            start, end = max(start + shift, self.now), min(end + shift, stop)
+            if end > start + self.epsilon:
+                self._log(start, end, name)
+        self.now = stop
+
+    def _step(self, until):
+        now = self.now
+        eps = self.epsilon
+        self.steps += 1
+        profile = self.phase_times is not None
+        if profile:
+            mark = time.perf_counter()
+
+        # --- 1. DEADLINE CHECK ---
+        if not self._check_deadlines(now):
+            if profile:
+                self._lap("deadlines", mark)
+            return
+        if profile:
+            mark = self._lap("deadlines", mark)
+
+        # --- 2. ARRIVALS (Multi-Instance Support) ---
+        self._release_jobs(now)
+        if profile:
+            mark = self._lap("arrivals", mark)
+
+        # --- 3. SERVER REPLENISHMENT ---
+        replenishments = self._replenishments
+        while replenishments and replenishments[0][0] <= now + eps:
+            at, _, idx, amount = heapq.heappop(replenishments)
+            self.servers[idx].replenish(at, amount)
+        if profile:
+            mark = self._lap("replenishment", mark)
+
+        # --- 4. SCHEDULING DECISION ---
+        selected_task, server_active, crossing = self._select(now)
+        if profile:
+            mark = self._lap("select", mark)
+
+        # --- 5. NEXT EVENT ---
+        next_time = self._next_release(until)
+        if replenishments:
+            next_time = min(next_time, replenishments[0][0])
+        if self._deadlines:
+            next_time = min(next_time, self._deadlines[0][0])
+        if selected_task is not None:
+            work = selected_task.current_job_rem
+            if server_active:
+                work = min(work, self.active_server.current_budget)
+            next_time = min(next_time, now + work)
+        if crossing is not None:
+            next_time = min(next_time, crossing)
+        if self._next_checkpoint is not None:
+            next_time = min(next_time, self._next_checkpoint)
+        if until - next_time <= eps:
+            next_time = until
+        if profile:
+            mark = self._lap("next_event", mark)
+
+        # --- 6. EXECUTION ---
+        elapsed = next_time - now
+        task_name_to_log = "Idle"
+
+        running = self._running
+        if running is not None and running is not selected_task:
+            running.preemptions += 1
+        self._running = None
+
+        if selected_task is not None:
+            task_name_to_log = selected_task.name
+            if selected_task.start_time is None:
+                selected_task.start_time = now
+            selected_task.current_job_rem -= elapsed
+            finished = selected_task.current_job_rem <= eps
+
+            if server_active:
+                server = self.active_server
+                if finished:
+                    server.queue.popleft()
+                    self._complete_aperiodic(selected_task, next_time)
+                server.consume(next_time, elapsed)
+                self.previous_selected_task = None
+            elif selected_task.task_type == 'Periodic':
+                if finished:
+                    # İş bitti, kuyruktan çıkar
+                    self.ready_queue.discard(selected_task)
+                    if self.job_sinks:
+                        self._emit_job(selected_task, selected_task.release_time, next_time,
+                                       next_time - selected_task.current_abs_deadline)
+                    self.job_pool.recycle(selected_task)
+                    self.previous_selected_task = None
+                else:
+                    self.previous_selected_task = selected_task
+            else:
+                # Background service of the aperiodic queue head
+                if finished:
+                    self.servers[selected_task.server].queue.popleft()
+                    self._complete_aperiodic(selected_task, next_time)
+                self.previous_selected_task = None
+            if not finished:
+                self._running = selected_task
+        else:
+            self.previous_selected_task = None
+        if profile:
+            mark = self._lap("execute", mark)
+
+        self._log(now, next_time, task_name_to_log)
+        self.now = next_time
+        if profile:
+            self._lap("log", mark)
+
+    def _check_deadlines(self, now):
+        """Count the jobs whose deadline passed unfinished; False if the run has to stop."""
+        eps = self.epsilon
+        deadlines = self._deadlines
+        while deadlines:
+            deadline, seq, job = deadlines[0]
+            # Entries of finished jobs are stale; their record may already be reused
+            if job.current_job_rem <= eps or job.seq != seq:
+                heapq.heappop(deadlines)
+                continue
+            if deadline > now + eps:
+                break
+            self.deadline_misses += 1
+            if self.missed_task is None:
+                self.missed_task = job.name
+                self.fail_time = self._to_time(now)
+            if not self.continue_after_miss:
+                self.error_info = f"DEADLINE MISSED!\nTask: {self.missed_task}"
+                return False
+            # The late job stays ready; only its deadline event is consumed
+            heapq.heappop(deadlines)
+        return True
+
+    def _release_jobs(self, now):
+        """Release the periodic jobs and aperiodic arrivals due at ``now``."""
+        eps = self.epsilon
+        deadlines = self._deadlines
+        releases = self._releases
+        while releases and releases[0][0] <= now + eps:
+            release, idx = heapq.heappop(releases)
+            t = self.sim_tasks[idx]
+            # Eski iş bitmese bile yeni iş eklenir (Overlap serbest)
+            t.instance_id += 1
+            new_job = self.job_pool.acquire(t, release, release + t.deadline, self._seq)
+            self._seq += 1
+            self.ready_queue.push(new_job)
+            heapq.heappush(deadlines, (new_job.current_abs_deadline, new_job.seq, new_job))
+            if t.period > 0:
+                # r + k*T instead of repeated addition keeps releases drift-free
+                t.next_release = t.release + t.instance_id * t.period
+                heapq.heappush(releases, (t.next_release, idx))
+
+        arrivals = self._arrivals
+        while self._next_arrival < len(arrivals) and arrivals[self._next_arrival].release <= now + eps:
+            t = arrivals[self._next_arrival]
+            t.current_job_rem = t.execution
+            self.servers[t.server].arrive(t, now)
+            self._next_arrival += 1
+
+    def _next_release(self, until):
+        """Earliest of ``until``, the next periodic release and the next aperiodic arrival."""
+        next_time = until
+        if self._releases:
+            next_time = min(next_time, self._releases[0][0])
+        if self._next_arrival < len(self._arrivals):
+            next_time = min(next_time, self._arrivals[self._next_arrival].release)
+        return next_time
+
+    def _complete_aperiodic(self, task, finish):
+        self.aperiodic_responses[task.name] = self._to_time(finish - task.release)
+        if self.job_sinks:
+            self._emit_job(task, task.release, finish, None)
+
+    def _emit_job(self, job, release, finish, lateness):
+        to_time = self._to_time
+        record = JobRecord(job.name, job.instance_id, job.task_type, to_time(release), to_time(job.start_time),
+                           to_time(finish), to_time(finish - release),
+                           to_time(lateness) if lateness is not None else None, job.preemptions)
+        for sink in self.job_sinks:
+            sink(record)
+
+    def _select(self, now):
+        """Pick the job to run at ``now``.
+
+        Returns ``(task, server_active, crossing)`` where ``crossing`` is the
+        next instant the policy wants to be consulted again without any other
+        event happening (``None`` if never).
+        """
+        # The most urgent ready server competes with the periodic jobs; lower index wins ties
+        server = None
+        key = self.policy.key
+        for candidate in self._foreground:
+            if candidate.ready():
+                candidate.refresh()
+                if server is None or key(candidate.job) < key(server.job) - self.epsilon:
+                    server = candidate
+        self.active_server = server
+
+        if not self.ready_queue and server is None:
+            for background in self._background:
+                if background.queue:
+                    return background.queue[0], False, None
+            return None, False, None
+
+        if server is not None:
+            self.server_job = server.job
+        return self.policy.select(self, now, server is not None)
+
+    def schedule_replenishment(self, server, at, amount=None):
+        """Book a call of ``server.replenish(at, amount)`` at the instant ``at``."""
+        heapq.heappush(self._replenishments, (at, self._bookings, server.index, amount))
+        self._bookings += 1
+
+    def _log(self, start, end, name):
+        # Log Optimization: contiguous blocks of the same task are merged
+        segment = self._open
+        if segment is not None and segment[2] == name and abs(segment[1] - start) <= self.epsilon:
+            segment[1] = end
+            if self.keep_log:
+                log = self.time_log
+                log[-1] = (log[-1][0], self._to_time(end), name)
+        elif end - start > self.epsilon:
+            if segment is not None:
+                self._emit(segment)
+            self._open = [start, end, name]
+            if self.keep_log:
+                self.time_log.append((self._to_time(start), self._to_time(end), name))
+        else:
+            return
+        if self._cycle_segments is not None and self._cycle_start is None:
+            self._cycle_segments.append((start, end, name))
+            if len(self._cycle_segments) > MAX_CYCLE_SEGMENTS:
+                self._stop_cycle_detection()
+
+    def _emit(self, segment):
+        if self.trace_sinks:
+            closed = (self._to_time(segment[0]), self._to_time(segment[1]), segment[2])
+            for sink in self.trace_sinks:
+                sink(closed)
+
+
+class Scheduler:
+    def __init__(self):
+        self.tasks = []
+        self.epsilon = 1e-5
+        self.llf_threshold = 0.1 
+        self.detect_cycles = True
+        self.time_base = "auto"
+        self.continue_after_miss = False
+        self.collect_metrics = False
+        self.cache_dir = None   # rts_loader cache for parse_input, off by default
+
+    def parse_input(self, file_path):
+        """Load the tasks of ``file_path``; returns ``(success, message)``.
+
+        Entries are validated (see ``rts_loader``), so a malformed line is
+        reported with its number and leaves ``tasks`` empty. With
+        ``cache_dir`` set, parsed files are cached there.
+        """
+        from rts_loader import TaskFileError, load_tasks
+        self.tasks = []
+        try:
+            self.tasks = load_tasks(file_path, self.cache_dir)
+        except (OSError, TaskFileError) as e:
+            return False, str(e)
+        return True, f"Loaded {len(self.tasks)} tasks."
+
+    def create_engine(self, algo, server_type, s_period, s_budget, keep_log=True, cores=1):
+        """Engine for the loaded tasks; ``cores`` > 1 gives an ``rts_multicore.GlobalEngine``."""
+        if cores > 1:
+            from rts_multicore import GlobalEngine
+            return GlobalEngine(self.tasks, algo, cores, server_type, s_period, s_budget,
+                                epsilon=self.epsilon, llf_threshold=self.llf_threshold,
+                                time_base=self.time_base, continue_after_miss=self.continue_after_miss,
+                                metrics=self.collect_metrics)
+        return SimulationEngine(self.tasks, algo, server_type, s_period, s_budget,
+                                epsilon=self.epsilon, llf_threshold=self.llf_threshold,
+                                detect_cycles=self.detect_cycles, time_base=self.time_base,
+                                keep_log=keep_log, continue_after_miss=self.continue_after_miss,
+                                metrics=self.collect_metrics)
+
+    def run_multicore(self, algo, server_type, s_period, s_budget, sim_duration, cores, mode="Global",
+                      heuristic="first-fit", workers=None):
+        """Simulate on ``cores`` processors; see ``rts_multicore.simulate_multicore``."""
+        from rts_multicore import simulate_multicore
+        return simulate_multicore(self.tasks, algo, server_type, s_period, s_budget, sim_duration, cores,
+                                  mode, heuristic, workers, epsilon=self.epsilon,
+                                  llf_threshold=self.llf_threshold, time_base=self.time_base,
+                                  continue_after_miss=self.continue_after_miss)
+
+    def run_simulation(self, algo, server_type, s_period, s_budget, sim_duration):
+        engine = self.create_engine(algo, server_type, s_period, s_budget)
+        engine.run(float(sim_duration))
+        return engine.time_log, engine.sim_tasks, engine.error_info, engine.fail_time
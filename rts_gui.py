@@ -0,0 +1,593 @@
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from tkinter import filedialog, messagebox, ttk
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+from matplotlib.patches import Patch
+
+from rts_cache import ResultCache, run_key
+from rts_core import POLICIES, SERVER_TYPES, Scheduler
+from rts_loader import default_cache_dir
+from rts_trace import TraceIndex
+
+POLL_MS = 16        # progress updates while a simulation runs (~60 fps)
+REDRAW_MS = 500     # partial Gantt refresh interval
+DRAIN_PER_POLL = 10000  # segments moved into the trace index per poll while running
+
+# Processor mode choices -> (rts_multicore mode, partitioning heuristic)
+PROCESSOR_MODES = {
+    "Global": ("Global", None),
+    "Partitioned (First-Fit)": ("Partitioned", "first-fit"),
+    "Partitioned (Best-Fit)": ("Partitioned", "best-fit"),
+}
+MAX_CORES = 64
+MAX_LEGEND_TASKS = 20
+
+# ==========================================
+# 2. USER INTERFACE
+# ==========================================
+
+class ModernRTSApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Real-Time Scheduling Simulator (Multi-Instance Support)")
+        self.root.geometry("1100x760")
+        
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        
+        self.colors = {
+            "bg": "#f4f6f9",
+            "panel_bg": "#ffffff",
+            "primary": "#3498db",
+            "text": "#2c3e50",
+            "accent": "#e74c3c"
+        }
+        self.root.configure(bg=self.colors["bg"])
+        
+        self.scheduler = Scheduler()
+        self.scheduler.cache_dir = default_cache_dir()
+        self.file_path = None
+        # Finished single-processor runs: repeating one is instant, a longer one resumes it
+        self.result_cache = ResultCache()
+        self.run_key = None
+
+        # Gantt state: LOD index of the last run and one bar collection per
+        # trace key (task name, or (core, task name) for processor lanes)
+        self.trace_index = None
+        self.row_bars = {}
+        self.row_y = {}
+        self.row_count = 0
+        self.chart_title = ""
+
+        # Background run: the worker thread only touches the engine; closed
+        # segments reach the UI thread through pending_segments
+        self.sim_thread = None
+        self.engine = None
+        self.sim_duration = 0.0
+        self.sim_error = None
+        self.pending_segments = deque()
+        self.multicore_result = None
+        self.last_redraw = 0.0
+        # While live, bars are animated artists blitted over a cached background
+        self.live = False
+        self.background = None
+        
+        self.budget_options = [str(i) for i in range(1, 4)]
+        self.period_options = [str(i) for i in range(5, 16)]
+
+        self.setup_layout()
+
+    def setup_layout(self):
+        self.root.columnconfigure(1, weight=1)
+        self.root.rowconfigure(0, weight=1)
+
+        left_panel = tk.Frame(self.root, bg=self.colors["panel_bg"], width=300, padx=20, pady=20)
+        left_panel.grid(row=0, column=0, sticky="ns")
+        left_panel.grid_propagate(False)
+
+        lbl_title = tk.Label(left_panel, text="RTS Configurator", font=("Helvetica", 16, "bold"), 
+                             bg=self.colors["panel_bg"], fg=self.colors["text"])
+        lbl_title.pack(pady=(0, 20), anchor="w")
+
+        self.create_section_header(left_panel, "1. Input Data")
+        
+        btn_browse = ttk.Button(left_panel, text="Load Input File (.txt)", command=self.load_file)
+        btn_browse.pack(fill="x", pady=5)
+        
+        self.lbl_filename = tk.Label(left_panel, text="No file loaded", bg="#ecf0f1", fg="#7f8c8d", 
+                                     font=("Consolas", 9), anchor="w", padx=5, pady=5)
+        self.lbl_filename.pack(fill="x", pady=(0, 15))
+
+        self.create_section_header(left_panel, "2. Scheduling Algorithm")
+        self.combo_algo = ttk.Combobox(left_panel, state="readonly", values=list(POLICIES))
+        self.combo_algo.current(0)
+        self.combo_algo.pack(fill="x", pady=(0, 15))
+
+        self.create_section_header(left_panel, "3. Server Settings")
+        
+        tk.Label(left_panel, text="Server Type:", bg=self.colors["panel_bg"]).pack(anchor="w")
+        self.combo_server = ttk.Combobox(left_panel, state="readonly", values=list(SERVER_TYPES))
+        self.combo_server.current(0)
+        self.combo_server.pack(fill="x", pady=5)
+        self.combo_server.bind("<<ComboboxSelected>>", self.toggle_server_inputs)
+
+        server_params_frame = tk.Frame(left_panel, bg=self.colors["panel_bg"])
+        server_params_frame.pack(fill="x", pady=5)
+        
+        tk.Label(server_params_frame, text="Budget (Cs):", bg=self.colors["panel_bg"]).grid(row=0, column=0, sticky="w")
+        self.combo_budget = ttk.Combobox(server_params_frame, state="readonly", values=self.budget_options, width=10)
+        self.combo_budget.current(0)
+        self.combo_budget.grid(row=0, column=1, padx=5, pady=2)
+        
+        tk.Label(server_params_frame, text="Period (Ts):", bg=self.colors["panel_bg"]).grid(row=1, column=0, sticky="w")
+        self.combo_period = ttk.Combobox(server_params_frame, state="readonly", values=self.period_options, width=10)
+        self.combo_period.current(0)
+        self.combo_period.grid(row=1, column=1, padx=5, pady=2)
+        
+        self.toggle_server_inputs(None)
+
+        self.create_section_header(left_panel, "4. Duration")
+        self.entry_duration = ttk.Entry(left_panel)
+        self.entry_duration.insert(0, "20")
+        self.entry_duration.pack(fill="x", pady=(0, 15))
+
+        self.create_section_header(left_panel, "5. Processors")
+        cores_frame = tk.Frame(left_panel, bg=self.colors["panel_bg"])
+        cores_frame.pack(fill="x", pady=(0, 10))
+
+        tk.Label(cores_frame, text="Cores:", bg=self.colors["panel_bg"]).grid(row=0, column=0, sticky="w")
+        self.spin_cores = ttk.Spinbox(cores_frame, from_=1, to=MAX_CORES, width=8, command=self.toggle_mode_input)
+        self.spin_cores.set(1)
+        self.spin_cores.grid(row=0, column=1, padx=5, pady=2, sticky="w")
+        self.spin_cores.bind("<KeyRelease>", self.toggle_mode_input)
+
+        tk.Label(cores_frame, text="Mode:", bg=self.colors["panel_bg"]).grid(row=1, column=0, sticky="w")
+        self.combo_mode = ttk.Combobox(cores_frame, state="readonly", values=list(PROCESSOR_MODES), width=22)
+        self.combo_mode.current(0)
+        self.combo_mode.grid(row=1, column=1, padx=5, pady=2, sticky="w")
+        self.toggle_mode_input()
+
+        style_btn = ttk.Style()
+        style_btn.configure("Accent.TButton", font=("Helvetica", 10, "bold"), foreground="black")
+        
+        self.btn_run = ttk.Button(left_panel, text="RUN SIMULATION", style="Accent.TButton", command=self.run_sim)
+        self.btn_run.pack(fill="x", pady=10, ipady=5)
+
+        self.btn_cancel = ttk.Button(left_panel, text="Cancel", command=self.cancel_sim, state='disabled')
+        self.btn_cancel.pack(fill="x", pady=(0, 10))
+
+        self.progress = ttk.Progressbar(left_panel, mode='determinate', maximum=100)
+        self.progress.pack(fill="x")
+        self.lbl_status = tk.Label(left_panel, text="", bg=self.colors["panel_bg"], fg="#7f8c8d",
+                                   font=("Consolas", 9), anchor="w")
+        self.lbl_status.pack(fill="x", pady=(5, 0))
+
+        right_panel = tk.Frame(self.root, bg="white")
+        right_panel.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
+        
+        self.figure, self.ax = plt.subplots(figsize=(8, 6))
+        self.figure.patch.set_facecolor('white')
+        self.canvas = FigureCanvasTkAgg(self.figure, master=right_panel)
+        # Pan/zoom only moves the x limits; draw_gantt re-queries the trace index on change
+        self.toolbar = NavigationToolbar2Tk(self.canvas, right_panel)
+        self.toolbar.update()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        
+        self.ax.text(0.5, 0.5, "Please load a file and run simulation", 
+                     horizontalalignment='center', verticalalignment='center', transform=self.ax.transAxes,
+                     color='gray', fontsize=12)
+        self.ax.axis('off')
+        self.canvas.draw()
+
+    def create_section_header(self, parent, text):
+        lbl = tk.Label(parent, text=text, font=("Segoe UI", 10, "bold"), 
+                       fg=self.colors["primary"], bg=self.colors["panel_bg"])
+        lbl.pack(anchor="w", pady=(10, 5))
+        separator = ttk.Separator(parent, orient='horizontal')
+        separator.pack(fill='x', pady=(0, 10))
+
+    def toggle_server_inputs(self, event):
+        val = self.combo_server.get()
+        if val == "Background":
+            self.combo_budget.config(state='disabled')
+            self.combo_period.config(state='disabled')
+        else:
+            self.combo_budget.config(state='readonly')
+            self.combo_period.config(state='readonly')
+
+    def toggle_mode_input(self, event=None):
+        self.combo_mode.config(state='readonly' if self.core_count() > 1 else 'disabled')
+
+    def core_count(self):
+        try:
+            return max(1, min(MAX_CORES, int(self.spin_cores.get())))
+        except ValueError:
+            return 1
+
+    def load_file(self):
+        filename = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
+        if filename:
+            self.file_path = filename
+            display_name = filename.split("/")[-1]
+            if len(display_name) > 25: display_name = display_name[:22] + "..."
+            self.lbl_filename.config(text=display_name, fg="black")
+            success, msg = self.scheduler.parse_input(filename)
+            if not success:
+                messagebox.showerror("Error", msg)
+
+    def run_sim(self):
+        if self.sim_thread is not None:
+            return
+        if not self.file_path:
+            messagebox.showwarning("Warning", "Please load an input file first.")
+            return
+
+        algo = self.combo_algo.get()
+        server_type = self.combo_server.get()
+        
+        s_budget = 0.0
+        s_period = 1.0 
+        
+        if server_type != "Background":
+            try:
+                s_budget = float(self.combo_budget.get())
+                s_period = float(self.combo_period.get())
+            except ValueError:
+                messagebox.showerror("Input Error", "Server Budget or Period error.")
+                return
+
+        try:
+            sim_dur = float(self.entry_duration.get())
+        except ValueError:
+            sim_dur = 50.0
+
+        cores = self.core_count()
+        if cores > 1:
+            self.run_multicore(algo, server_type, s_period, s_budget, sim_dur, cores)
+            return
+
+        key = run_key(self.scheduler, algo, server_type, s_period, s_budget)
+        cached = self.result_cache.get(key, sim_dur)
+        if cached is not None:
+            self.sim_duration = sim_dur
+            self.progress['value'] = 100
+            self.lbl_status.config(text="Cached result")
+            self.draw_gantt(cached.time_log, self.scheduler.tasks, sim_dur, cached.error_info, cached.fail_time)
+            if cached.error_info:
+                messagebox.showerror("Scheduling Aborted", f"{cached.error_info}\nTime: {cached.fail_time:.2f}")
+            return
+
+        # A shorter cached run continues from its checkpoint; its trace is already in time_log
+        engine = self.result_cache.resume(key, sim_dur)
+        if engine is None:
+            try:
+                engine = self.scheduler.create_engine(algo, server_type, s_period, s_budget)
+            except ValueError as e:
+                messagebox.showerror("Input Error", str(e))
+                return
+
+        self.engine = engine
+        self.run_key = key
+        self.sim_duration = sim_dur
+        self.sim_error = None
+        self.live = True
+        self.pending_segments.clear()
+        self.pending_segments.extend(engine.time_log)
+        engine.trace_sinks.append(self.pending_segments.append)
+        self.setup_gantt([t.name for t in engine.sim_tasks], sim_dur,
+                         f"Scheduling: {algo} | Server: {server_type}")
+
+        self.btn_run.config(state='disabled')
+        self.btn_cancel.config(state='normal')
+        self.progress['value'] = 0
+        self.sim_thread = threading.Thread(target=self.simulate, args=(engine, sim_dur), daemon=True)
+        self.sim_thread.start()
+        self.last_redraw = time.monotonic()
+        self.root.after(POLL_MS, self.poll_simulation)
+
+    def run_multicore(self, algo, server_type, s_period, s_budget, sim_dur, cores):
+        """Global runs use one engine on the worker thread, partitioned ones a process pool."""
+        mode, heuristic = PROCESSOR_MODES[self.combo_mode.get()]
+        engine = None
+        if mode == "Global":
+            try:
+                engine = self.scheduler.create_engine(algo, server_type, s_period, s_budget, cores=cores)
+            except ValueError as e:
+                messagebox.showerror("Input Error", str(e))
+                return
+            target = engine.run
+            args = (sim_dur,)
+        else:
+            target = self.scheduler.run_multicore
+            args = (algo, server_type, s_period, s_budget, sim_dur, cores, mode, heuristic)
+
+        self.engine = engine
+        self.sim_duration = sim_dur
+        self.sim_error = None
+        self.multicore_result = None
+        self.chart_title = f"Scheduling: {algo} | Server: {server_type} | {cores} cores, {self.combo_mode.get()}"
+
+        self.btn_run.config(state='disabled')
+        self.btn_cancel.config(state='normal' if engine is not None else 'disabled')
+        self.progress['value'] = 0
+        if engine is None:
+            # No progress from the pool: show activity only
+            self.progress.config(mode='indeterminate')
+            self.progress.start(POLL_MS)
+        self.lbl_status.config(text=f"Simulating on {cores} cores...")
+        self.sim_thread = threading.Thread(target=self.simulate_multicore, args=(target, args), daemon=True)
+        self.sim_thread.start()
+        self.root.after(POLL_MS, self.poll_multicore)
+
+    def simulate_multicore(self, target, args):
+        # Runs on the worker thread
+        try:
+            self.multicore_result = target(*args)
+        except Exception as e:
+            self.sim_error = e
+
+    def poll_multicore(self):
+        engine = self.engine
+        now = self.sim_duration
+        if engine is not None:
+            now = engine.current_time
+            if self.sim_duration > 0:
+                self.progress['value'] = min(100.0, 100.0 * now / self.sim_duration)
+            self.lbl_status.config(text=f"t = {now:.2f} / {self.sim_duration:g}")
+        if self.sim_thread.is_alive():
+            self.root.after(POLL_MS, self.poll_multicore)
+            return
+
+        self.sim_thread = None
+        self.progress.stop()
+        self.progress.config(mode='determinate')
+        self.btn_run.config(state='normal')
+        self.btn_cancel.config(state='disabled')
+        if self.sim_error is not None:
+            self.progress['value'] = 0
+            self.lbl_status.config(text="Simulation failed")
+            messagebox.showerror("Simulation Error", str(self.sim_error))
+            return
+        if engine is None:
+            self.progress['value'] = 100
+        result = engine.result() if engine is not None else self.multicore_result
+        cancelled = engine is not None and engine.cancelled and now < self.sim_duration
+        self.lbl_status.config(text=f"Cancelled at t = {now:.2f}" if cancelled else "")
+        self.draw_core_gantt(result.core_logs, self.sim_duration, self.chart_title)
+        self.finish_gantt(result.error_info, result.fail_time, cancelled)
+
+        if result.error_info:
+            messagebox.showerror("Scheduling Aborted", f"{result.error_info}\nTime: {result.fail_time:.2f}")
+
+    def simulate(self, engine, duration):
+        # Runs on the worker thread
+        try:
+            engine.run(duration)
+            engine.flush_trace()
+        except Exception as e:
+            self.sim_error = e
+
+    def cancel_sim(self):
+        if self.engine is not None:
+            self.engine.cancel()
+        self.btn_cancel.config(state='disabled')
+
+    def drain_segments(self, limit=None):
+        pending = self.pending_segments
+        add = self.trace_index.add
+        count = len(pending) if limit is None else min(limit, len(pending))
+        for _ in range(count):
+            add(pending.popleft())
+
+    def poll_simulation(self):
+        engine = self.engine
+        self.drain_segments(DRAIN_PER_POLL)
+        now = engine.current_time
+        if self.sim_duration > 0:
+            self.progress['value'] = min(100.0, 100.0 * now / self.sim_duration)
+        self.lbl_status.config(text=f"t = {now:.2f} / {self.sim_duration:g}")
+
+        if self.sim_thread.is_alive():
+            if time.monotonic() - self.last_redraw >= REDRAW_MS / 1000:
+                self.refresh_bars()
+                self.blit_bars()
+                self.last_redraw = time.monotonic()
+            self.root.after(POLL_MS, self.poll_simulation)
+            return
+
+        # Worker finished, was cancelled or failed
+        self.sim_thread = None
+        self.live = False
+        self.drain_segments()
+        self.btn_run.config(state='normal')
+        self.btn_cancel.config(state='disabled')
+        if self.sim_error is not None:
+            self.lbl_status.config(text="Simulation failed")
+            messagebox.showerror("Simulation Error", str(self.sim_error))
+            return
+        # A cancelled run is a valid prefix too: running again resumes it
+        self.result_cache.store(self.run_key, engine)
+        cancelled = engine.cancelled and now < self.sim_duration
+        if cancelled:
+            self.lbl_status.config(text=f"Cancelled at t = {now:.2f}")
+        self.finish_gantt(engine.error_info, engine.fail_time, cancelled)
+        
+        if engine.error_info:
+            messagebox.showerror("Scheduling Aborted", f"{engine.error_info}\nTime: {engine.fail_time:.2f}")
+
+    def draw_gantt(self, log, task_list, duration, error_info, fail_time):
+        """Draw a finished run in one go."""
+        self.live = False
+        self.setup_gantt([t.name for t in task_list], duration,
+                         f"Scheduling: {self.combo_algo.get()} | Server: {self.combo_server.get()}")
+        for segment in log:
+            self.trace_index.add(segment)
+        self.finish_gantt(error_info, fail_time)
+
+    def setup_gantt(self, task_names, duration, title):
+        """Empty chart with one row per task; segments are added to ``trace_index``."""
+        self.ax.clear()
+        self.ax.axis('on')
+        
+        unique_tasks = sorted(set(task_names))
+        colors = plt.get_cmap('Pastel1', len(unique_tasks) + 1)
+        
+        y_pos = {name: i for i, name in enumerate(unique_tasks)}
+        
+        self.ax.grid(True, which='both', axis='x', linestyle='--', linewidth=0.5, color='gray', alpha=0.3)
+        self.ax.set_axisbelow(True)
+
+        # Bars are drawn from the LOD index: one collection per row, only visible merged segments
+        self.trace_index = TraceIndex()
+        self.row_bars = {name: self.ax.broken_barh([], (y_pos[name] - 0.3, 0.6), facecolors=colors(y_pos[name]),
+                                                   edgecolor='none')
+                         for name in unique_tasks}
+        self.row_y = y_pos
+        self.row_count = len(unique_tasks)
+
+        self.ax.set_ylim(-1, len(unique_tasks))
+        self.ax.set_xlim(0, duration)
+        
+        self.ax.set_xlabel('Time Units (s)', fontsize=10, fontweight='bold')
+        self.ax.set_yticks(range(len(unique_tasks)))
+        self.ax.set_yticklabels(unique_tasks, fontsize=10, fontweight='bold')
+        
+        self.chart_title = title
+        self.ax.set_title(title, fontsize=12, pad=10, color=self.colors["text"])
+        
+        self.figure.tight_layout()
+        self.refresh_bars()
+        # ax.clear() drops callbacks, so the zoom hook is attached for every new chart
+        self.ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+        self.toolbar.update()
+        self.canvas.draw()
+
+    def draw_core_gantt(self, core_logs, duration, title):
+        """One lane per processor, bars colored by task."""
+        self.live = False
+        self.ax.clear()
+        self.ax.axis('on')
+
+        keys = sorted({(core, name) for core, log in enumerate(core_logs) for _, _, name in log if name != "Idle"})
+        unique_tasks = sorted({name for _, name in keys})
+        colors = plt.get_cmap('Pastel1', len(unique_tasks) + 1)
+        color_of = {name: colors(i) for i, name in enumerate(unique_tasks)}
+        cores = len(core_logs)
+
+        self.ax.grid(True, which='both', axis='x', linestyle='--', linewidth=0.5, color='gray', alpha=0.3)
+        self.ax.set_axisbelow(True)
+
+        self.trace_index = TraceIndex()
+        for core, log in enumerate(core_logs):
+            for start, end, name in log:
+                if name != "Idle":
+                    self.trace_index.add((start, end, (core, name)))
+        self.row_bars = {key: self.ax.broken_barh([], (key[0] - 0.3, 0.6), facecolors=color_of[key[1]],
+                                                  edgecolor='none')
+                         for key in keys}
+        self.row_y = {key: key[0] for key in keys}
+        self.row_count = cores
+
+        self.ax.set_ylim(-1, cores)
+        self.ax.set_xlim(0, duration)
+        self.ax.set_xlabel('Time Units (s)', fontsize=10, fontweight='bold')
+        self.ax.set_yticks(range(cores))
+        self.ax.set_yticklabels([f"CPU{core}" for core in range(cores)], fontsize=10, fontweight='bold')
+        if len(unique_tasks) <= MAX_LEGEND_TASKS:
+            self.ax.legend(handles=[Patch(facecolor=color_of[name], label=name) for name in unique_tasks],
+                           loc='upper left', bbox_to_anchor=(1.0, 1.0), fontsize=8, frameon=False)
+
+        self.chart_title = title
+        self.ax.set_title(title, fontsize=12, pad=10, color=self.colors["text"])
+        self.figure.tight_layout()
+        self.refresh_bars()
+        self.ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+        self.toolbar.update()
+        self.canvas.draw()
+
+    def finish_gantt(self, error_info, fail_time, cancelled=False):
+        rows = self.row_count
+        if error_info:
+            self.ax.axvline(x=fail_time, color='red', linestyle='-', linewidth=2.5)
+            self.ax.annotate('DEADLINE MISS', xy=(fail_time, rows-0.5), 
+                             xytext=(fail_time, rows+0.2),
+                             color='red', fontweight='bold', ha='center',
+                             arrowprops=dict(facecolor='red', shrink=0.05))
+            self.ax.set_xlim(0, fail_time + 1.0)
+
+        title_str = self.chart_title
+        if error_info:
+            title_str += " [ABORTED]"
+        elif cancelled:
+            title_str += " [CANCELLED]"
+            
+        self.ax.set_title(title_str, fontsize=12, pad=10,
+                          color='red' if error_info else self.colors["text"])
+        
+        self.refresh_bars()
+        self.toolbar.update()
+        self.canvas.draw()
+
+    def refresh_bars(self):
+        """Load the segments visible at the current zoom into each row's collection."""
+        if self.trace_index is None:
+            return
+        t0, t1 = self.ax.get_xlim()
+        pixels = self.ax.get_window_extent().width
+        visible = self.trace_index.query(t0, t1, pixels)
+        for key, bars in self.row_bars.items():
+            bars.set_verts(bar_verts(visible.get(key), self.row_y[key] - 0.3, 0.6))
+            bars.set_animated(self.live)
+
+    def blit_bars(self):
+        """Redraw only the bar collections on top of the cached background."""
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        for bars in self.row_bars.values():
+            self.ax.draw_artist(bars)
+        self.canvas.blit(self.ax.bbox)
+
+    def on_draw(self, event):
+        # A full redraw skips animated bars: cache the result, then blit them on top
+        if self.live:
+            self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self.blit_bars()
+        else:
+            self.background = None
+
+    def on_xlim_changed(self, ax):
+        self.refresh_bars()
+        self.canvas.draw_idle()
+
+
+def bar_verts(spans, y, height):
+    """``(start, width)`` spans as an ``(n, 4, 2)`` rectangle array for ``PolyCollection.set_verts``."""
+    verts = np.empty((len(spans) if spans else 0, 4, 2))
+    if spans:
+        spans = np.asarray(spans)
+        x0 = spans[:, 0]
+        x1 = x0 + spans[:, 1]
+        verts[:, :, 0] = np.column_stack((x0, x0, x1, x1))
+        verts[:, :, 1] = (y, y + height, y + height, y)
+    return verts
+
+
+def main():
+    root = tk.Tk()
+    try:
+        from ctypes import windll
+        windll.shcore.SetProcessDpiAwareness(1)
+    except:
+        pass
+    app = ModernRTSApp(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""Validated task-set loading with an on-disk cache.
+
+Task files hold one task per line; blank lines and lines starting with
+``#`` are skipped::
+
+    P ri ei pi di       periodic task: release, execution, period, deadline
+    P ri ei pi          ... with di = pi
+    P ei pi             ... with ri = 0 and di = pi
+    D ei pi di          periodic task released at 0 with its own deadline
+    A ri ei             aperiodic task
+
+``iter_records`` parses a stream line by line and raises ``TaskFileError``
+naming the file and line of the first malformed entry. ``parse_columns``
+turns a whole file into ``TaskColumns`` arrays: with NumPy installed the
+entire text is converted in one pass, and only a text that does not come
+out as a well-formed set (an error, or an unusual layout such as
+whitespace-only lines) goes through the line parser, which then reports
+the exact line.
+
+``load_tasks`` adds a binary cache: ``cache_dir`` holds one file per input
+path with the columns and the size, modification time and SHA-256 of the
+text they came from. An unchanged file is loaded from the cache without
+reading it; a touched but identical file is recognised by its hash::
+
+    tasks = load_tasks("set1.txt", default_cache_dir())
+"""
+import hashlib
+import math
+import os
+import struct
+import sys
+import warnings
+from array import array
+from collections import namedtuple
+from operator import itemgetter
+
+from rts_core import Task
+
+# One entry per task in file order. kinds holds b"P" (periodic, from 'P' and
+# 'D' lines) or b"A" per task, the other columns are array('d') values.
+TaskColumns = namedtuple("TaskColumns", "kinds release execution period deadline")
+
+# Relative deadline given to aperiodic tasks
+APERIODIC_DEADLINE = 99999.0
+
+# (line type, number of values) -> value index for release, execution,
+# period and deadline; None takes the column default from COLUMN_DEFAULTS
+LAYOUTS = {
+    ("P", 4): (0, 1, 2, 3),
+    ("P", 3): (0, 1, 2, 2),
+    ("P", 2): (None, 0, 1, 1),
+    ("D", 3): (None, 0, 1, 2),
+    ("A", 2): (0, 1, None, None),
+}
+COLUMN_DEFAULTS = (0.0, None, 0.0, APERIODIC_DEADLINE)
+_VALUE_COUNTS = {}
+for _kind, _count in LAYOUTS:
+    _VALUE_COUNTS.setdefault(_kind, []).append(_count)
+
+# The line parser appends _DEFAULT_TAIL to the values of a line, so every
+# layout becomes one itemgetter; defaults are read from the tail
+_DEFAULT_TAIL = [0.0, APERIODIC_DEADLINE]
+_GETTERS = {key: itemgetter(*(i if i is not None else _DEFAULT_TAIL.index(default) - len(_DEFAULT_TAIL)
+                              for i, default in zip(layout, COLUMN_DEFAULTS)))
+            for key, layout in LAYOUTS.items()}
+
+MAGIC = b"RTSC"
+VERSION = 3
+# magic, version, file size, file mtime (ns), SHA-256 of the file, task count
+_HEADER = struct.Struct("<4sHQq32sQ")
+
+# Stand-ins for the line types in the vectorized pass; valid values are never negative
+_SENTINELS = {"P": -1e300, "D": -2e300, "A": -3e300}
+_END = -4e300
+
+
+class TaskFileError(ValueError):
+    """Malformed task file; ``line`` is the 1-based line number (None for the whole file)."""
+
+    def __init__(self, path, line, message):
+        self.path = path
+        self.line = line
+        where = f"{path}, line {line}" if line is not None else str(path)
+        super().__init__(f"{where}: {message}")
+
+
+def _line_error(path, lineno, fields):
+    """The ``TaskFileError`` for a line whose layout or numbers are not accepted."""
+    kind = fields[0]
+    counts = _VALUE_COUNTS.get(kind)
+    if counts is None:
+        return TaskFileError(path, lineno, f"unknown task type '{kind}' (expected P, D or A)")
+    if len(fields) - 1 not in counts:
+        expected = " or ".join(str(n) for n in sorted(counts))
+        return TaskFileError(path, lineno, f"'{kind}' takes {expected} values, got {len(fields) - 1}")
+    for field in fields[1:]:
+        try:
+            valid = math.isfinite(float(field))
+        except ValueError:
+            valid = False
+        if not valid:
+            return TaskFileError(path, lineno, f"invalid number '{field}'")
+    return TaskFileError(path, lineno, "malformed line")
+
+
+def _check(path, lineno, kind, release, execution, period, deadline):
+    if release < 0:
+        raise TaskFileError(path, lineno, "release time must not be negative")
+    if execution <= 0:
+        raise TaskFileError(path, lineno, "execution time must be positive")
+    if period <= 0 and kind != 'A':
+        raise TaskFileError(path, lineno, "period must be positive")
+    if deadline <= 0:
+        raise TaskFileError(path, lineno, "deadline must be positive")
+
+
+def iter_records(lines, path="<input>"):
+    """Yield ``(kind, release, execution, period, deadline)`` for every task line.
+
+    ``lines`` is any iterable of text lines, e.g. an open file, so a file
+    is parsed without holding it in memory. ``kind`` is 'P' or 'A'.
+    """
+    isfinite = math.isfinite
+    for lineno, line in enumerate(lines, 1):
+        fields = line.split()
+        if not fields or fields[0][0] == '#':
+            continue
+        getter = _GETTERS.get((fields[0], len(fields) - 1))
+        try:
+            values = [float(field) for field in fields[1:]]
+        except ValueError:
+            getter = None
+        if getter is None or not all(map(isfinite, values)):
+            raise _line_error(path, lineno, fields)
+        kind = 'A' if fields[0] == 'A' else 'P'
+        release, execution, period, deadline = record = getter(values + _DEFAULT_TAIL)
+        # Only aperiodic tasks go without a period
+        if release < 0 or execution <= 0 or (period <= 0 and kind == 'P') or deadline <= 0:
+            _check(path, lineno, kind, *record)
+        yield (kind,) + record
+
+
+def _parse_vectorized(text, np):
+    """Convert ``text`` in one pass with the module ``np``; None if it needs the line parser."""
+    lines = text.splitlines()
+    if "#" in text:
+        lines = [line for line in lines if not line.lstrip().startswith("#")]
+        text = "\n".join(lines)
+    # Type letters only mark records as a line's first token ('P1 2 3' is no 'P' line)
+    for line in lines:
+        head = line.split(None, 1)
+        if head and head[0] not in _SENTINELS:
+            return None
+    # Every line must start a record, so records and non-empty lines pair up
+    expected = len(lines) - lines.count("")
+    for kind, sentinel in _SENTINELS.items():
+        text = text.replace(kind, f" {sentinel!r} ")
+    try:
+        with warnings.catch_warnings():
+            # Older NumPy versions warn and stop at unparsable text instead of raising
+            warnings.simplefilter("ignore")
+            values = np.fromstring(f"{text} {_END!r}", sep=" ")
+    except ValueError:
+        return None
+    if not len(values) or values[-1] != _END:
+        return None
+    values = values[:-1]
+
+    starts = np.flatnonzero(values <= _SENTINELS["P"])
+    if len(starts) != expected or (len(values) and (not len(starts) or starts[0] != 0)):
+        return None
+    counts = np.diff(np.append(starts, len(values))) - 1
+    codes = values[starts]
+    columns = [np.empty(len(starts)) for _ in COLUMN_DEFAULTS]
+    matched = np.zeros(len(starts), dtype=bool)
+    for (kind, count), layout in LAYOUTS.items():
+        rows = (codes == _SENTINELS[kind]) & (counts == count)
+        if not rows.any():
+            continue
+        matched |= rows
+        first = starts[rows] + 1
+        for column, index, default in zip(columns, layout, COLUMN_DEFAULTS):
+            column[rows] = values[first + index] if index is not None else default
+    if not matched.all():
+        return None
+    release, execution, period, deadline = columns
+    if not (np.isfinite(columns).all() and (release >= 0).all() and (execution > 0).all()
+            and ((period > 0) | (codes == _SENTINELS["A"])).all() and (deadline > 0).all()):
+        return None
+    kinds = np.where(codes == _SENTINELS["A"], ord("A"), ord("P")).astype(np.uint8).tobytes()
+    return TaskColumns(kinds, *(array("d", column.tobytes()) for column in columns))
+
+
+def parse_columns(text, path="<input>"):
+    """Parse the content of a task file into ``TaskColumns``."""
+    # Imported here so that front-ends importing this module start fast
+    try:
+        import numpy as np
+    except ImportError:  # the line parser needs no NumPy
+        np = None
+    if np is not None:
+        columns = _parse_vectorized(text, np)
+        if columns is not None:
+            return columns
+    records = list(iter_records(text.splitlines(), path))
+    if not records:
+        return TaskColumns(b"", *(array("d") for _ in COLUMN_DEFAULTS))
+    kinds, *columns = zip(*records)
+    return TaskColumns("".join(kinds).encode(), *(array("d", column) for column in columns))
+
+
+def tasks_from_columns(columns):
+    """``Task`` objects named like the file parser does (P1, P2, ... and A1, A2, ...)."""
+    tasks = []
+    p_count = 0
+    a_count = 0
+    for kind, release, execution, period, deadline in zip(*columns):
+        if kind == ord("A"):
+            a_count += 1
+            tasks.append(Task(f"A{a_count}", release, execution, period, deadline, 'Aperiodic'))
+        else:
+            p_count += 1
+            tasks.append(Task(f"P{p_count}", release, execution, period, deadline, 'Periodic'))
+    return tasks
+
+
+def default_cache_dir():
+    """``$RTS_CACHE_DIR``, else ``rts_scheduler`` in the user's cache directory."""
+    if os.environ.get("RTS_CACHE_DIR"):
+        return os.environ["RTS_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "rts_scheduler")
+
+
+def cache_path(cache_dir, path):
+    """Cache file of the task file ``path`` inside ``cache_dir``."""
+    key = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:32]
+    return os.path.join(cache_dir, f"{key}.rtsc")
+
+
+def _little_endian(column):
+    if sys.byteorder == "big":
+        column = array("d", column)
+        column.byteswap()
+    return column
+
+
+def _read_cache(entry):
+    """``(size, mtime_ns, digest, columns)`` stored in ``entry``, None if missing or unusable."""
+    try:
+        with open(entry, "rb") as f:
+            data = f.read()
+        magic, version, size, mtime_ns, digest, count = _HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return None
+    if magic != MAGIC or version != VERSION or len(data) != _HEADER.size + count * 33:
+        return None
+    offset = _HEADER.size
+    kinds = data[offset:offset + count]
+    offset += count
+    columns = []
+    for _ in COLUMN_DEFAULTS:
+        column = _little_endian(array("d", data[offset:offset + 8 * count]))
+        columns.append(column)
+        offset += 8 * count
+    return size, mtime_ns, digest, TaskColumns(kinds, *columns)
+
+
+def _write_cache(entry, stat, digest, columns):
+    """Store ``columns`` in ``entry``; the cache is best effort, so failures are ignored."""
+    count = len(columns.kinds)
+    temp = f"{entry}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        with open(temp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, stat.st_size, stat.st_mtime_ns, digest, count))
+            f.write(columns.kinds)
+            for column in columns[1:]:
+                f.write(_little_endian(column).tobytes())
+        os.replace(temp, entry)
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+
+def load_columns(path, cache_dir=None):
+    """``TaskColumns`` of the task file ``path``, through the cache in ``cache_dir`` if given."""
+    stat = os.stat(path)
+    entry = cache_path(cache_dir, path) if cache_dir else None
+    cached = _read_cache(entry) if entry else None
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[3]
+
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).digest()
+    if cached is not None and cached[2] == digest:
+        columns = cached[3]
+    else:
+        try:
+            text = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise TaskFileError(path, None, "not a text file") from None
+        columns = parse_columns(text, path)
+    if entry:
+        _write_cache(entry, stat, digest, columns)
+    return columns
+
+
+def load_tasks(path, cache_dir=None):
+    """Parse (or fetch from the cache) the task file ``path`` as ``Task`` objects."""
+    return tasks_from_columns(load_columns(path, cache_dir))
@@ -0,0 +1,196 @@
+"""Streaming per-task statistics over ``JobRecord`` streams.
+
+``MetricsCollector`` is a job sink for ``SimulationEngine.job_sinks`` (or use
+``SimulationEngine(..., metrics=True)``). Per task it keeps count, mean,
+standard deviation, min and max of the response time, start delay
+(start - release), lateness and preemptions, plus relative-error quantile
+sketches, so memory does not grow with the number of jobs::
+
+    engine = SimulationEngine(tasks, "EDF", "Deferrable", 5, 2,
+                              keep_log=False, continue_after_miss=True, metrics=True)
+    engine.run(1e5)
+    for row in engine.metrics.summary():
+        print(row["task"], row["response_p99"], row["misses"])
+"""
+import math
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+SUMMARY_FIELDS = ("task", "type", "jobs", "misses", "response_mean", "response_max", "response_p50",
+                  "response_p90", "response_p99", "response_jitter", "start_delay_mean", "start_delay_max",
+                  "lateness_max", "preemptions_mean", "preemptions_max")
+
+
+class QuantileSketch:
+    """DDSketch-style quantile sketch with ``relative_accuracy`` error bound.
+
+    Positive values fall into logarithmic buckets of ratio
+    ``gamma = (1 + a) / (1 - a)``, negative values into a mirrored store and
+    values within ``min_value`` of zero into a zero count. Any quantile is
+    returned within a relative error ``a``. Past ``max_buckets`` per store
+    the buckets nearest to zero are collapsed, which only costs accuracy
+    on the lowest quantiles.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048, min_value=1e-9):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.count = 0
+        self.zero_count = 0
+        self._positive = {}
+        self._negative = {}
+
+    def _key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key):
+        # Midpoint (in relative terms) of the bucket (gamma^(k-1), gamma^k]
+        return 2 * self.gamma ** key / (1 + self.gamma)
+
+    def add(self, value):
+        self.count += 1
+        if value > self.min_value:
+            store = self._positive
+            key = self._key(value)
+        elif value < -self.min_value:
+            store = self._negative
+            key = self._key(-value)
+        else:
+            self.zero_count += 1
+            return
+        store[key] = store.get(key, 0) + 1
+        if len(store) > self.max_buckets:
+            self._collapse(store)
+
+    def _collapse(self, store):
+        keys = sorted(store)
+        floor = keys[len(keys) - self.max_buckets]
+        merged = sum(store.pop(k) for k in keys if k < floor)
+        store[floor] += merged
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("cannot merge sketches with different accuracy")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for mine, theirs in ((self._positive, other._positive), (self._negative, other._negative)):
+            for key, n in theirs.items():
+                mine[key] = mine.get(key, 0) + n
+            if len(mine) > self.max_buckets:
+                self._collapse(mine)
+
+    def quantile(self, q):
+        """Approximate ``q``-quantile (0 <= q <= 1); ``None`` if nothing was added."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self._positive))
+
+
+class StreamingStats:
+    """Count, mean, standard deviation (Welford), min, max and a quantile sketch."""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / self.count) if self.count else None
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+
+class TaskMetrics:
+    def __init__(self, task_type, relative_accuracy=0.01):
+        self.task_type = task_type
+        self.jobs = 0
+        self.misses = 0
+        self.response = StreamingStats(relative_accuracy)
+        self.start_delay = StreamingStats(relative_accuracy)
+        self.lateness = StreamingStats(relative_accuracy)
+        self.preemptions = StreamingStats(relative_accuracy)
+
+
+class MetricsCollector:
+    """Job sink aggregating ``JobRecord``s per task.
+
+    Only jobs that complete are seen; ``misses`` counts completed jobs that
+    finished after their deadline (``SimulationEngine.deadline_misses``
+    also counts jobs still unfinished at the end of the run).
+    """
+
+    def __init__(self, relative_accuracy=0.01, epsilon=1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.epsilon = epsilon
+        self.tasks = {}
+
+    def __call__(self, record):
+        metrics = self.tasks.get(record.name)
+        if metrics is None:
+            metrics = self.tasks[record.name] = TaskMetrics(record.task_type, self.relative_accuracy)
+        metrics.jobs += 1
+        metrics.response.add(record.response)
+        metrics.start_delay.add(record.start - record.release)
+        metrics.preemptions.add(record.preemptions)
+        if record.lateness is not None:
+            metrics.lateness.add(record.lateness)
+            if record.lateness > self.epsilon:
+                metrics.misses += 1
+
+    def summary(self):
+        """One dict per task (``SUMMARY_FIELDS``), periodic tasks first, by name."""
+        rows = []
+        for name, m in sorted(self.tasks.items(), key=lambda item: (item[1].task_type != 'Periodic', item[0])):
+            response = m.response
+            row = {
+                "task": name,
+                "type": m.task_type,
+                "jobs": m.jobs,
+                "misses": m.misses,
+                "response_mean": response.mean,
+                "response_max": response.max,
+                "response_jitter": response.max - response.min,
+                "start_delay_mean": m.start_delay.mean,
+                "start_delay_max": m.start_delay.max,
+                "lateness_max": m.lateness.max,
+                "preemptions_mean": m.preemptions.mean,
+                "preemptions_max": m.preemptions.max,
+            }
+            for q in DEFAULT_QUANTILES:
+                row[f"response_p{round(q * 100)}"] = response.quantile(q)
+            rows.append(row)
+        return rows
@@ -0,0 +1,283 @@
+"""Monte Carlo acceptance-ratio studies on randomly generated task sets.
+
+Example::
+
+    python rts_montecarlo.py --tasks 8 --sets 10000 --umin 0.5 --umax 1.0 --ustep 0.025 \\
+        --algos RM EDF -o acceptance.csv --plot acceptance.png
+
+Task sets are generated in batches: utilizations with UUniFast (Bini &
+Buttazzo), periods log-uniform in ``[tmin, tmax]`` and deadlines as a
+uniform fraction of the period. Every test then runs on whole
+``(sets, tasks)`` NumPy arrays at once:
+
+* RM/DM: exact response-time analysis, iterated for all sets and tasks
+  together until every response time has converged or exceeded its deadline,
+* EDF: U <= 1 for implicit deadlines, otherwise the processor-demand test
+  in its QPA form, again stepping all sets together.
+
+Only synchronous, constrained-deadline (D <= T) sets are generated, which is
+what makes these tests exact.
+"""
+import argparse
+import csv
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from rts_analysis import EPSILON
+from rts_core import Task
+
+# Periods, executions and deadlines of a batch, each of shape (sets, tasks)
+TaskSetBatch = namedtuple("TaskSetBatch", "periods executions deadlines")
+
+# Busy-period iterations tried for U = 1 sets before giving up on them
+MAX_BUSY_ITERATIONS = 10000
+
+CURVE_FIELDS = ("utilization", "sets")
+
+
+def uunifast(rng, sets, tasks, utilization):
+    """Per-task utilizations of shape ``(sets, tasks)``, each row summing to ``utilization``."""
+    utils = np.empty((sets, tasks))
+    remaining = np.full(sets, float(utilization))
+    for i in range(tasks - 1):
+        following = remaining * rng.random(sets) ** (1.0 / (tasks - 1 - i))
+        utils[:, i] = remaining - following
+        remaining = following
+    utils[:, -1] = remaining
+    return utils
+
+
+def log_uniform_periods(rng, sets, tasks, tmin=10.0, tmax=1000.0, granularity=None):
+    """Periods log-uniform in ``[tmin, tmax]``, optionally rounded to a multiple of ``granularity``."""
+    periods = np.exp(rng.uniform(np.log(tmin), np.log(tmax), (sets, tasks)))
+    if granularity:
+        periods = np.maximum(np.round(periods / granularity), 1) * granularity
+    return periods
+
+
+def generate(rng, sets, tasks, utilization, tmin=10.0, tmax=1000.0, granularity=None,
+             deadline_range=(1.0, 1.0)):
+    """Random task sets with total utilization ``utilization``.
+
+    ``deadline_range`` gives the bounds of D/T; the upper bound is clipped
+    to 1 and the deadline never drops below the execution time.
+    """
+    periods = log_uniform_periods(rng, sets, tasks, tmin, tmax, granularity)
+    executions = uunifast(rng, sets, tasks, utilization) * periods
+    low, high = deadline_range
+    high = min(high, 1.0)
+    if low >= high:
+        deadlines = periods * high
+    else:
+        deadlines = periods * rng.uniform(low, high, (sets, tasks))
+    deadlines = np.maximum(deadlines, executions)
+    return TaskSetBatch(periods, executions, deadlines)
+
+
+def task_set(batch, index):
+    """Set ``index`` of ``batch`` as ``Task`` objects, e.g. to feed the simulator."""
+    return [Task(f"P{i + 1}", 0.0, c, t, d, 'Periodic')
+            for i, (c, t, d) in enumerate(zip(batch.executions[index], batch.periods[index],
+                                              batch.deadlines[index]))]
+
+
+def response_time_test(batch, by_deadline=False):
+    """Exact RM (or DM with ``by_deadline``) test; boolean array of shape ``(sets,)``."""
+    keys = batch.deadlines if by_deadline else batch.periods
+    order = np.argsort(keys, axis=1, kind="stable")
+    periods = np.take_along_axis(batch.periods, order, axis=1)
+    executions = np.take_along_axis(batch.executions, order, axis=1)
+    deadlines = np.take_along_axis(batch.deadlines, order, axis=1)
+    tasks = periods.shape[1]
+    # higher[i, j]: task j has higher priority than task i
+    higher = np.tri(tasks, k=-1, dtype=bool)
+
+    response = np.cumsum(executions, axis=1)
+    active = response <= deadlines + EPSILON
+    while active.any():
+        jobs = np.ceil(response[:, :, None] / periods[:, None, :] - EPSILON)
+        nxt = executions + np.where(higher, jobs * executions[:, None, :], 0.0).sum(axis=2)
+        nxt = np.where(active, nxt, response)
+        active &= (nxt > response + EPSILON) & (nxt <= deadlines + EPSILON)
+        response = nxt
+    return (response <= deadlines + EPSILON).all(axis=1)
+
+
+def _last_deadline(batch_d, batch_t, x):
+    """Latest absolute deadline strictly before ``x`` in every set (-inf if none)."""
+    k = np.ceil((x[:, None] - batch_d) / batch_t - EPSILON) - 1
+    last = np.where(k >= 0, batch_d + k * batch_t, -np.inf)
+    return last.max(axis=1)
+
+
+def _demand(batch_d, batch_t, batch_c, t):
+    jobs = np.floor((t[:, None] - batch_d) / batch_t + EPSILON) + 1
+    return (np.maximum(jobs, 0) * batch_c).sum(axis=1)
+
+
+def _busy_period(T, C):
+    """Synchronous busy period of every set; NaN where it has not converged."""
+    busy = C.sum(axis=1)
+    active = np.ones(len(busy), dtype=bool)
+    for _ in range(MAX_BUSY_ITERATIONS):
+        nxt = (np.ceil(busy[:, None] / T - EPSILON) * C).sum(axis=1)
+        active &= nxt > busy + EPSILON
+        if not active.any():
+            return busy
+        busy = np.where(active, nxt, busy)
+    return np.where(active, np.nan, busy)
+
+
+def _qpa(T, C, D, horizon):
+    """QPA over the sets of ``(T, C, D)``; boolean array of the sets without a miss."""
+    d_min = D.min(axis=1)
+    t = _last_deadline(D, T, horizon + 2 * EPSILON)
+    ok = np.ones(len(t), dtype=bool)
+    active = np.ones(len(t), dtype=bool)
+    while active.any():
+        a = np.flatnonzero(active)
+        demand = _demand(D[a], T[a], C[a], t[a])
+        missed = demand > t[a] + EPSILON
+        ok[a[missed]] = False
+        done = missed | (demand <= d_min[a] + EPSILON)
+        active[a[done]] = False
+        step = a[~done]
+        demand = demand[~done]
+        shrink = demand < t[step] - EPSILON
+        t[step] = np.where(shrink, demand, _last_deadline(D[step], T[step], t[step]))
+    return ok
+
+
+def demand_test(batch):
+    """Exact EDF test; boolean array of shape ``(sets,)``.
+
+    Constrained sets run Quick Processor-demand Analysis (Zhang & Burns):
+    starting below the L* bound, ``t`` jumps to ``dbf(t)`` while that is
+    smaller, otherwise to the previous absolute deadline, until ``dbf(t)``
+    exceeds ``t`` (miss) or drops to the smallest relative deadline. At
+    U = 1 the bound is the synchronous busy period instead; sets whose busy
+    period does not converge within ``MAX_BUSY_ITERATIONS`` are inconclusive
+    and counted as rejected.
+    """
+    periods, executions, deadlines = batch
+    u = (executions / periods).sum(axis=1)
+    accepted = u <= 1 + EPSILON
+    constrained = accepted & (deadlines < periods - EPSILON).any(axis=1)
+
+    idx = np.flatnonzero(constrained & (u < 1 - EPSILON))
+    if len(idx):
+        T, C, D, U = periods[idx], executions[idx], deadlines[idx], u[idx]
+        horizon = np.maximum(((T - D) * C / T).sum(axis=1) / (1 - U), D.max(axis=1))
+        accepted[idx] = _qpa(T, C, D, horizon)
+
+    idx = np.flatnonzero(constrained & (u >= 1 - EPSILON))
+    if len(idx):
+        T, C, D = periods[idx], executions[idx], deadlines[idx]
+        horizon = _busy_period(T, C)
+        bounded = ~np.isnan(horizon)
+        ok = np.zeros(len(idx), dtype=bool)
+        if bounded.any():
+            ok[bounded] = _qpa(T[bounded], C[bounded], D[bounded], horizon[bounded])
+        accepted[idx] = ok
+    return accepted
+
+
+TESTS = {
+    "RM": lambda batch: response_time_test(batch),
+    "DM": lambda batch: response_time_test(batch, by_deadline=True),
+    "EDF": demand_test,
+}
+
+
+def acceptance_curves(utilizations, tasks=8, sets=1000, algos=tuple(TESTS), seed=None, **generate_kwargs):
+    """Acceptance ratio of every algorithm at every utilization level.
+
+    Returns one row per utilization: ``{"utilization", "sets", <algo>: ratio, ...}``.
+    All algorithms see the same task sets at a given level.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for utilization in utilizations:
+        batch = generate(rng, sets, tasks, utilization, **generate_kwargs)
+        row = {"utilization": float(utilization), "sets": sets}
+        for algo in algos:
+            row[algo] = float(TESTS[algo](batch).mean())
+        rows.append(row)
+    return rows
+
+
+def plot_curves(rows, algos, path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    x = [row["utilization"] for row in rows]
+    for algo in algos:
+        ax.plot(x, [row[algo] for row in rows], marker="o", markersize=3, label=algo)
+    ax.set_xlabel("Total utilization")
+    ax.set_ylabel("Acceptance ratio")
+    ax.set_ylim(-0.02, 1.02)
+    ax.grid(True, linestyle=":", alpha=0.6)
+    ax.legend()
+    fig.savefig(path, dpi=150, bbox_inches="tight")
+    plt.close(fig)
+
+
+def _algorithm(value):
+    for name in TESTS:
+        if name.lower() == value.lower():
+            return name
+    raise argparse.ArgumentTypeError(f"unknown algorithm '{value}' (choose from {', '.join(TESTS)})")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="rts_montecarlo", description="Acceptance-ratio curves over random task sets.")
+    parser.add_argument("-n", "--tasks", type=int, default=8, help="tasks per set (default: 8)")
+    parser.add_argument("--sets", type=int, default=1000, help="task sets per utilization level (default: 1000)")
+    parser.add_argument("--umin", type=float, default=0.05, help="lowest utilization (default: 0.05)")
+    parser.add_argument("--umax", type=float, default=1.0, help="highest utilization (default: 1.0)")
+    parser.add_argument("--ustep", type=float, default=0.05, help="utilization step (default: 0.05)")
+    parser.add_argument("--tmin", type=float, default=10.0, help="shortest period (default: 10)")
+    parser.add_argument("--tmax", type=float, default=1000.0, help="longest period (default: 1000)")
+    parser.add_argument("--granularity", type=float, help="round periods to multiples of this value")
+    parser.add_argument("--deadlines", nargs=2, type=float, default=(1.0, 1.0), metavar=("LOW", "HIGH"),
+                        help="range of D/T (default: 1 1, implicit deadlines)")
+    parser.add_argument("--algos", nargs="+", type=_algorithm, default=list(TESTS),
+                        help="tests to run (default: RM DM EDF)")
+    parser.add_argument("--seed", type=int, help="random seed")
+    parser.add_argument("-o", "--output", help="CSV output file (default: stdout)")
+    parser.add_argument("--plot", help="also save the curves as an image")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.tasks < 1 or args.sets < 1 or args.ustep <= 0 or not 0 < args.tmin <= args.tmax:
+        print("invalid generation parameters", file=sys.stderr)
+        return 1
+
+    count = int(round((args.umax - args.umin) / args.ustep)) + 1
+    utilizations = np.round(args.umin + args.ustep * np.arange(max(count, 1)), 10)
+    rows = acceptance_curves(utilizations, args.tasks, args.sets, args.algos, args.seed,
+                             tmin=args.tmin, tmax=args.tmax, granularity=args.granularity,
+                             deadline_range=tuple(args.deadlines))
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=CURVE_FIELDS + tuple(args.algos))
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.plot:
+        plot_curves(rows, args.algos, args.plot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""Multiprocessor scheduling on identical processors.
+
+Two modes are offered:
+
+* global: ``GlobalEngine`` runs the ``cores`` most urgent ready jobs at every
+  event (global RM, DM or EDF); jobs may migrate between processors,
+* partitioned: ``partition`` assigns every task to one processor with first-
+  or best-fit decreasing bin packing by utilization, using the analytical
+  tests of ``rts_analysis`` as admission check. Each processor is then an
+  ordinary uniprocessor ``SimulationEngine``, and ``run_partitioned``
+  simulates them concurrently in a process pool.
+
+Both return a ``MulticoreResult`` whose ``core_logs`` hold one merged
+``(start, end, name)`` trace per processor::
+
+    result = simulate_multicore(tasks, "Earliest Deadline First (EDF)", "Background", 5, 1,
+                                duration=100, cores=4, mode="Partitioned", heuristic="best-fit")
+"""
+import itertools
+import os
+from collections import namedtuple
+from multiprocessing import Pool
+
+from rts_analysis import EPSILON, precheck, utilization
+from rts_core import SchedulingPolicy, SimulationEngine
+
+MODES = ("Global", "Partitioned")
+
+# Tasks per processor (``cores``), processor of the aperiodic server (None if it
+# has none) and the tasks that fit on no processor
+Partition = namedtuple("Partition", "cores server_core unassigned")
+
+# assignment maps task name -> processor for partitioned runs, None for global ones
+MulticoreResult = namedtuple("MulticoreResult",
+                             "core_logs error_info fail_time missed_task deadline_misses assignment")
+
+
+class GlobalEngine(SimulationEngine):
+    """Global scheduling of one task set on ``cores`` identical processors.
+
+    At every event the ``cores`` most urgent ready jobs by the policy key
+    run in parallel, and aperiodic tasks are served FIFO in the background
+    on the processors left idle. A selected job keeps the processor it ran
+    on, newly selected jobs take the free processors in index order, and
+    ``migrations`` counts jobs resumed on a different processor.
+
+    Only policies with a static job key (RM, DM, EDF) can be scheduled
+    globally, and only background service of aperiodic tasks. Every
+    processor has its own trace in ``core_logs``; ``time_log`` stays empty
+    and cycle detection is not used.
+    """
+
+    def __init__(self, tasks, algo, cores, server_type="Background", s_period=1.0, s_budget=0.0, **kwargs):
+        kwargs["detect_cycles"] = False
+        super().__init__(tasks, algo, server_type, s_period, s_budget, **kwargs)
+        if cores < 1:
+            raise ValueError("At least one processor is required.")
+        if type(self.policy).select is not SchedulingPolicy.select:
+            raise ValueError(f"{self.algo} cannot be scheduled globally.")
+        if server_type != 'Background' or len(self.servers) > 1:
+            raise ValueError("Global scheduling only serves aperiodic tasks in the background.")
+        self.cores = cores
+        self.core_logs = [[] for _ in range(cores)]
+        self.migrations = 0
+        self._assigned = [None] * cores     # unfinished job on every processor after the last step
+        self._core_end = [None] * cores     # internal end of every processor's last segment
+        self._last_core = {}                # unfinished job -> processor it last ran on
+
+    def _step(self, until):
+        now = self.now
+        eps = self.epsilon
+        self.steps += 1
+
+        if not self._check_deadlines(now):
+            return
+        self._release_jobs(now)
+
+        # Most urgent periodic jobs first, background aperiodic work on the rest
+        selected = self.ready_queue.smallest(self.cores)
+        if len(selected) < self.cores:
+            selected.extend(itertools.islice(self.aperiodic_queue, self.cores - len(selected)))
+        chosen = set(selected)
+
+        # Jobs that stay selected keep their processor; the others fill the free ones in order
+        previous = self._assigned
+        assigned = [job if job in chosen else None for job in previous]
+        placed = set(assigned)
+        free = (c for c in range(self.cores) if assigned[c] is None)
+        for job in selected:
+            if job not in placed:
+                core = next(free)
+                assigned[core] = job
+                last = self._last_core.get(job)
+                if last is not None and last != core:
+                    self.migrations += 1
+        for job in previous:
+            if job is not None and job not in chosen:
+                job.preemptions += 1
+
+        next_time = self._next_release(until)
+        if self._deadlines:
+            next_time = min(next_time, self._deadlines[0][0])
+        for job in assigned:
+            if job is not None:
+                next_time = min(next_time, now + job.current_job_rem)
+        if until - next_time <= eps:
+            next_time = until
+
+        elapsed = next_time - now
+        for core, job in enumerate(assigned):
+            if job is None:
+                self._log_core(core, now, next_time, "Idle")
+                continue
+            self._log_core(core, now, next_time, job.name)
+            if job.start_time is None:
+                job.start_time = now
+            job.current_job_rem -= elapsed
+            if job.current_job_rem > eps:
+                self._last_core[job] = core
+                continue
+            assigned[core] = None
+            self._last_core.pop(job, None)
+            if job.task_type == 'Periodic':
+                self.ready_queue.discard(job)
+                if self.job_sinks:
+                    self._emit_job(job, job.release_time, next_time, next_time - job.current_abs_deadline)
+                self.job_pool.recycle(job)
+            else:
+                self.aperiodic_queue.remove(job)
+                self._complete_aperiodic(job, next_time)
+
+        self._assigned = assigned
+        self.now = next_time
+
+    def result(self):
+        return MulticoreResult(self.core_logs, self.error_info, self.fail_time, self.missed_task,
+                               self.deadline_misses, None)
+
+    def _log_core(self, core, start, end, name):
+        # Same merging as SimulationEngine._log, once per processor
+        log = self.core_logs[core]
+        if log and log[-1][2] == name and abs(self._core_end[core] - start) <= self.epsilon:
+            log[-1] = (log[-1][0], self._to_time(end), name)
+        elif end - start > self.epsilon:
+            log.append((self._to_time(start), self._to_time(end), name))
+        else:
+            return
+        self._core_end[core] = end
+
+
+def run_global(tasks, algo, cores, duration, server_type="Background", s_period=1.0, s_budget=0.0,
+               **engine_kwargs):
+    engine = GlobalEngine(tasks, algo, cores, server_type, s_period, s_budget, **engine_kwargs)
+    engine.run(float(duration))
+    return engine.result()
+
+
+def _fits(tasks, algo, server_type, s_period, s_budget):
+    """Admission test for one processor: the analytical verdict must be positive."""
+    load = utilization(tasks)
+    if server_type != 'Background':
+        load += float(s_budget) / float(s_period)
+    if load > 1 + EPSILON:
+        return False
+    if algo == "Least Laxity First (LLF)":
+        # No LLF test; LLF is optimal on one processor like EDF (hysteresis aside)
+        algo = "Earliest Deadline First (EDF)"
+    return precheck(tasks, algo, server_type, s_period, s_budget).schedulable is True
+
+
+def _first_fit(candidates, loads):
+    return candidates[0]
+
+
+def _best_fit(candidates, loads):
+    # Tightest fit: the fullest processor that still accepts the task
+    return max(candidates, key=lambda core: loads[core])
+
+
+HEURISTICS = {"first-fit": _first_fit, "best-fit": _best_fit}
+
+
+def partition(tasks, cores, algo, server_type="Background", s_period=1.0, s_budget=0.0, heuristic="first-fit"):
+    """Bin-pack ``tasks`` onto ``cores`` processors, decreasing utilization first.
+
+    A processor accepts a task if ``rts_analysis.precheck`` still proves its
+    set schedulable. The aperiodic tasks travel together with their server,
+    packed as one item of utilization Cs/Ts; with background service they
+    go to the least loaded processor once the periodic tasks are placed.
+    """
+    if cores < 1:
+        raise ValueError("At least one processor is required.")
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown partitioning heuristic: {heuristic}")
+    choose = HEURISTICS[heuristic]
+
+    periodic = [t for t in tasks if t.task_type == 'Periodic']
+    aperiodic = [t for t in tasks if t.task_type == 'Aperiodic']
+    items = [(t.execution / t.period if t.period > 0 else 0.0, [t], False) for t in periodic]
+    with_server = server_type != 'Background' and aperiodic
+    if with_server:
+        items.append((float(s_budget) / float(s_period), aperiodic, True))
+    items.sort(key=lambda item: -item[0])  # stable: equal utilizations keep input order
+
+    assigned = [[] for _ in range(cores)]
+    loads = [0.0] * cores
+    server_core = None
+    unassigned = []
+    for load, item_tasks, is_server in items:
+        candidates = []
+        for core in range(cores):
+            serves = is_server or core == server_core
+            if _fits(assigned[core] + item_tasks, algo, server_type if serves else 'Background',
+                     s_period, s_budget):
+                candidates.append(core)
+        if not candidates:
+            unassigned.extend(item_tasks)
+            continue
+        core = choose(candidates, loads)
+        assigned[core].extend(item_tasks)
+        loads[core] += load
+        if is_server:
+            server_core = core
+
+    if aperiodic and not with_server:
+        core = min(range(cores), key=lambda c: loads[c])
+        assigned[core].extend(aperiodic)
+    return Partition(assigned, server_core, unassigned)
+
+
+def _run_core(job):
+    tasks, algo, server_type, s_period, s_budget, duration, engine_kwargs = job
+    engine = SimulationEngine(tasks, algo, server_type, s_period, s_budget, **engine_kwargs)
+    engine.run(float(duration))
+    return {
+        "time_log": engine.time_log,
+        "error_info": engine.error_info,
+        "fail_time": engine.fail_time,
+        "missed_task": engine.missed_task,
+        "deadline_misses": engine.deadline_misses,
+    }
+
+
+def run_partitioned(part, algo, duration, server_type="Background", s_period=1.0, s_budget=0.0, workers=None,
+                    **engine_kwargs):
+    """Simulate every processor of ``part`` on its own, concurrently on a process pool.
+
+    The processors are independent, so each runs the whole ``duration``;
+    ``fail_time``/``missed_task`` report the earliest miss over all of them.
+    """
+    if part.unassigned:
+        names = ", ".join(t.name for t in part.unassigned)
+        raise ValueError(f"No processor can accept: {names}")
+
+    jobs = [(core_tasks, algo, server_type if core == part.server_core else 'Background', s_period, s_budget,
+             duration, engine_kwargs)
+            for core, core_tasks in enumerate(part.cores)]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        results = [_run_core(job) for job in jobs]
+    else:
+        with Pool(processes=workers) as pool:
+            results = pool.map(_run_core, jobs)
+
+    error_info = None
+    fail_time = 0.0
+    missed_task = None
+    misses = [(r["fail_time"], core) for core, r in enumerate(results) if r["missed_task"] is not None]
+    if misses:
+        fail_time, core = min(misses)
+        missed_task = results[core]["missed_task"]
+        if results[core]["error_info"]:
+            error_info = f"{results[core]['error_info']} (CPU{core})"
+    assignment = {t.name: core for core, core_tasks in enumerate(part.cores) for t in core_tasks}
+    return MulticoreResult([r["time_log"] for r in results], error_info, fail_time, missed_task,
+                           sum(r["deadline_misses"] for r in results), assignment)
+
+
+def simulate_multicore(tasks, algo, server_type, s_period, s_budget, duration, cores, mode="Global",
+                       heuristic="first-fit", workers=None, **engine_kwargs):
+    """Run ``tasks`` on ``cores`` processors in ``mode`` (see ``MODES``)."""
+    if mode == "Global":
+        return run_global(tasks, algo, cores, duration, server_type, s_period, s_budget, **engine_kwargs)
+    if mode == "Partitioned":
+        part = partition(tasks, cores, algo, server_type, s_period, s_budget, heuristic)
+        return run_partitioned(part, algo, duration, server_type, s_period, s_budget, workers, **engine_kwargs)
+    raise ValueError(f"Unknown multiprocessor mode: {mode}")
@@ -0,0 +1,267 @@
+"""Parallel parameter sweeps over algorithm x server x Cs x Ts grids.
+
+Example::
+
+    python rts_sweep.py set1.txt set2.txt --algos RM EDF --servers Poller Deferrable \\
+        --duration 100 --workers 8 -o sweep.csv
+
+Each worker process receives the parsed task sets once, through the pool
+initializer; afterwards only small configuration tuples travel to the workers
+and result records travel back, in completion order. Simulations go through
+an ``rts_cache.ResultCache`` per worker, so task sets with identical content
+are simulated once, and with ``--result-dir`` a repeated sweep is answered
+from disk (a longer ``--duration`` resumes the stored runs).
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import sys
+from multiprocessing import Pool
+
+from rts_analysis import precheck as analytical_precheck
+from rts_cache import ResultCache, default_store_dir
+from rts_cli import resolve_algorithm, resolve_server
+from rts_core import POLICIES, SERVER_TYPES, Scheduler, server_supported
+from rts_loader import default_cache_dir, load_tasks
+
+# Same ranges ModernRTSApp offers in its budget/period comboboxes
+DEFAULT_BUDGETS = (1.0, 2.0, 3.0)
+DEFAULT_PERIODS = tuple(float(p) for p in range(5, 16))
+
+RUN_FIELDS = ("file", "algorithm", "server", "budget", "period", "duration", "feasible",
+              "missed_task", "fail_time", "aperiodic_served", "aperiodic_total",
+              "mean_response", "max_response", "source")
+SUMMARY_FIELDS = ("algorithm", "server", "budget", "period", "task_sets", "feasible",
+                  "feasible_ratio", "earliest_miss", "mean_response", "max_response")
+
+_worker_task_sets = None
+_worker_cache = None
+
+
+def _init_worker(task_sets, result_dir=None):
+    global _worker_task_sets, _worker_cache
+    _worker_task_sets = task_sets
+    _worker_cache = ResultCache(result_dir, keep_trace=False)
+
+
+def load_task_sets(paths, cache_dir=None):
+    """Parse every input file once; returns ``[(path, tasks), ...]``.
+
+    Malformed files raise ``rts_loader.TaskFileError`` (a ``ValueError``)
+    naming the line. With ``cache_dir`` parsed files are kept in the
+    ``rts_loader`` cache, so sweeping the same sets again skips parsing.
+    """
+    task_sets = []
+    for path in paths:
+        try:
+            task_sets.append((path, load_tasks(path, cache_dir)))
+        except OSError as e:
+            raise ValueError(f"{path}: {e}") from None
+    return task_sets
+
+
+def sweep_grid(algos, servers, budgets, periods):
+    """Yield ``(algo, server_type, budget, period)`` for every meaningful combination.
+
+    Background service ignores Cs/Ts, so it contributes a single configuration,
+    and combinations with a budget larger than the period are skipped, as are
+    servers the algorithm cannot drive (TBS/CBS under fixed priorities).
+    """
+    for algo in algos:
+        for server_type in servers:
+            if not server_supported(algo, server_type):
+                continue
+            if server_type == 'Background':
+                yield algo, server_type, 0.0, 1.0
+                continue
+            for budget, period in itertools.product(budgets, periods):
+                if budget <= period:
+                    yield algo, server_type, float(budget), float(period)
+
+
+def _run_config(job):
+    set_idx, algo, server_type, budget, period, duration, precheck = job
+    name, tasks = _worker_task_sets[set_idx]
+
+    if precheck:
+        verdict = analytical_precheck(tasks, algo, server_type, period, budget)
+        # A miss the analysis predicts may lie beyond ``duration``, so only a pass stands in for the run
+        if verdict.schedulable and not verdict.needs_simulation:
+            return {
+                "file": name,
+                "algorithm": algo,
+                "server": server_type,
+                "budget": budget,
+                "period": period,
+                "duration": duration,
+                "feasible": True,
+                "missed_task": None,
+                "fail_time": None,
+                "aperiodic_served": 0,
+                "aperiodic_total": 0,
+                "mean_response": None,
+                "max_response": None,
+                "source": verdict.test,
+            }
+
+    scheduler = Scheduler()
+    scheduler.tasks = tasks
+    result = _worker_cache.simulate(scheduler, algo, server_type, period, budget, duration)
+
+    responses = list(result.aperiodic_responses.values())
+    return {
+        "file": name,
+        "algorithm": algo,
+        "server": server_type,
+        "budget": budget,
+        "period": period,
+        "duration": duration,
+        "feasible": result.error_info is None,
+        "missed_task": result.missed_task,
+        "fail_time": result.fail_time if result.error_info else None,
+        "aperiodic_served": len(responses),
+        "aperiodic_total": sum(1 for t in tasks if t.task_type == 'Aperiodic'),
+        "mean_response": sum(responses) / len(responses) if responses else None,
+        "max_response": max(responses) if responses else None,
+        "source": "simulation",
+    }
+
+
+def iter_sweep(task_sets, algos=None, servers=None, budgets=DEFAULT_BUDGETS,
+               periods=DEFAULT_PERIODS, duration=20.0, workers=None, chunksize=None,
+               precheck=False, result_dir=None):
+    """Run every task set against the whole grid, yielding records as runs finish.
+
+    ``task_sets`` is a list of ``(name, tasks)`` pairs (see ``load_task_sets``).
+    Results arrive in completion order, not submission order. With
+    ``workers=1`` everything runs in the calling process. With ``precheck``
+    the analytical tests of ``rts_analysis`` answer the configurations they
+    prove schedulable on their own (no aperiodic tasks) and the simulation
+    is skipped for them; such records name the deciding test in ``source``.
+    ``result_dir`` keeps the simulation results on disk (see ``rts_cache``)
+    for later sweeps.
+    """
+    algos = list(POLICIES) if algos is None else list(algos)
+    servers = list(SERVER_TYPES) if servers is None else list(servers)
+    grid = list(sweep_grid(algos, servers, budgets, periods))
+    jobs = [(idx,) + config + (float(duration), precheck)
+            for idx in range(len(task_sets)) for config in grid]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        _init_worker(task_sets, result_dir)
+        for job in jobs:
+            yield _run_config(job)
+        return
+
+    if chunksize is None:
+        # A few chunks per worker balances the load without flooding the pipe
+        chunksize = max(1, math.ceil(len(jobs) / (workers * 4)))
+    with Pool(workers, initializer=_init_worker, initargs=(task_sets, result_dir)) as pool:
+        yield from pool.imap_unordered(_run_config, jobs, chunksize)
+
+
+def summarize(results):
+    """Aggregate run records per configuration across all task sets.
+
+    Rows are ordered best first: highest feasible ratio, then lowest mean
+    aperiodic response time.
+    """
+    groups = {}
+    for r in results:
+        key = (r["algorithm"], r["server"], r["budget"], r["period"])
+        g = groups.setdefault(key, {"task_sets": 0, "feasible": 0, "earliest_miss": None,
+                                    "response_sum": 0.0, "served": 0, "max_response": None})
+        g["task_sets"] += 1
+        if r["feasible"]:
+            g["feasible"] += 1
+        elif r["fail_time"] is not None and (g["earliest_miss"] is None
+                                             or r["fail_time"] < g["earliest_miss"]):
+            g["earliest_miss"] = r["fail_time"]
+        if r["aperiodic_served"]:
+            g["response_sum"] += r["mean_response"] * r["aperiodic_served"]
+            g["served"] += r["aperiodic_served"]
+            if g["max_response"] is None or r["max_response"] > g["max_response"]:
+                g["max_response"] = r["max_response"]
+
+    table = []
+    for (algo, server_type, budget, period), g in groups.items():
+        table.append({
+            "algorithm": algo,
+            "server": server_type,
+            "budget": budget,
+            "period": period,
+            "task_sets": g["task_sets"],
+            "feasible": g["feasible"],
+            "feasible_ratio": g["feasible"] / g["task_sets"],
+            "earliest_miss": g["earliest_miss"],
+            "mean_response": g["response_sum"] / g["served"] if g["served"] else None,
+            "max_response": g["max_response"],
+        })
+    table.sort(key=lambda row: (-row["feasible_ratio"],
+                                row["mean_response"] if row["mean_response"] is not None else math.inf))
+    return table
+
+
+def run_sweep(task_sets, **kwargs):
+    """Blocking variant of ``iter_sweep`` returning the ``summarize`` table."""
+    return summarize(iter_sweep(task_sets, **kwargs))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="rts_sweep", description="Sweep algorithms and server parameters over task sets in parallel.")
+    parser.add_argument("files", nargs="+", help="task set input files")
+    parser.add_argument("--algos", nargs="+", type=resolve_algorithm, help="algorithms (default: all)")
+    parser.add_argument("--servers", nargs="+", type=resolve_server, help="server types (default: all)")
+    parser.add_argument("--budgets", nargs="+", type=float, default=DEFAULT_BUDGETS, help="server budgets Cs")
+    parser.add_argument("--periods", nargs="+", type=float, default=DEFAULT_PERIODS, help="server periods Ts")
+    parser.add_argument("-d", "--duration", type=float, default=20.0, help="simulation length (default: 20)")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, help="configurations per task sent to a worker")
+    parser.add_argument("--precheck", action="store_true",
+                        help="skip simulations that schedulability analysis proves feasible")
+    parser.add_argument("--per-run", action="store_true",
+                        help="stream one row per run instead of the aggregated table")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always parse the task files instead of using the parse cache")
+    parser.add_argument("--result-dir",
+                        help="keep simulation results in this directory and reuse them in later sweeps "
+                             f"(e.g. {default_store_dir()})")
+    parser.add_argument("-o", "--output", help="CSV output file (default: stdout)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        task_sets = load_task_sets(args.files, None if args.no_cache else default_cache_dir())
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    results = iter_sweep(task_sets, algos=args.algos, servers=args.servers, budgets=args.budgets,
+                         periods=args.periods, duration=args.duration, workers=args.workers,
+                         chunksize=args.chunksize, precheck=args.precheck,
+                         result_dir=args.result_dir)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.per_run:
+            writer = csv.DictWriter(out, fieldnames=RUN_FIELDS)
+            writer.writeheader()
+            for record in results:
+                writer.writerow(record)
+        else:
+            writer = csv.DictWriter(out, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(summarize(results))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
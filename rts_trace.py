@@ -0,0 +1,220 @@
+"""Compact binary trace files for ``SimulationEngine`` segments.
+
+A ``TraceWriter`` is a trace sink: append it to ``engine.trace_sinks`` (or
+feed it from ``engine.stream``) and every closed segment is buffered and
+written out in blocks, so a run of any length needs constant memory::
+
+    engine = SimulationEngine(tasks, "EDF", "Poller", 5, 1, keep_log=False)
+    with TraceWriter("run.rtst") as writer:
+        engine.trace_sinks.append(writer)
+        engine.run(1e6)
+        engine.flush_trace()
+
+File layout (little endian): the 6-byte header ``MAGIC`` + version, then a
+sequence of records. A record starts with a ``uint16`` name id followed by
+``float64 start, float64 end`` (18 bytes). The id ``NAME_RECORD`` instead
+introduces a new name: ``uint16 length`` and the UTF-8 bytes; names are
+numbered in order of appearance. ``read_trace`` stops at a truncated final
+record, so a file can be read while it is still being written.
+
+``TraceIndex`` answers "what is visible between t0 and t1 at this pixel
+width" for drawing, independent of the trace length.
+"""
+import bisect
+import math
+import struct
+
+MAGIC = b"RTST"
+VERSION = 1
+NAME_RECORD = 0xFFFF
+
+_HEADER = struct.Struct("<4sH")
+_SEGMENT = struct.Struct("<Hdd")
+_NAME = struct.Struct("<HH")
+
+
+class TraceFormatError(ValueError):
+    pass
+
+
+class TraceWriter:
+    """Sink writing ``(start, end, name)`` segments to a binary trace file."""
+
+    def __init__(self, path, buffer_segments=4096):
+        self.path = path
+        self.buffer_segments = buffer_segments
+        self.count = 0
+        self._names = {}
+        self._buffer = bytearray()
+        self._pending = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION))
+
+    def __call__(self, segment):
+        start, end, name = segment
+        name_id = self._names.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            if name_id >= NAME_RECORD:
+                raise ValueError("too many distinct segment names for one trace")
+            self._names[name] = name_id
+            encoded = name.encode("utf-8")
+            self._buffer += _NAME.pack(NAME_RECORD, len(encoded))
+            self._buffer += encoded
+        self._buffer += _SEGMENT.pack(name_id, start, end)
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.buffer_segments:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+        self._pending = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trace(path):
+    """Yield the ``(start, end, name)`` segments of a trace file in order."""
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise TraceFormatError(f"{path}: not a trace file")
+        magic, version = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise TraceFormatError(f"{path}: not a trace file")
+        if version != VERSION:
+            raise TraceFormatError(f"{path}: unsupported trace version {version}")
+
+        names = []
+        data = b""
+        while True:
+            chunk = f.read(1 << 16)
+            if not chunk:
+                return
+            data += chunk
+            offset = 0
+            while len(data) - offset >= _NAME.size:
+                (name_id,) = struct.unpack_from("<H", data, offset)
+                if name_id == NAME_RECORD:
+                    _, length = _NAME.unpack_from(data, offset)
+                    if len(data) - offset < _NAME.size + length:
+                        break
+                    start = offset + _NAME.size
+                    names.append(data[start:start + length].decode("utf-8"))
+                    offset = start + length
+                else:
+                    if len(data) - offset < _SEGMENT.size:
+                        break
+                    _, start, end = _SEGMENT.unpack_from(data, offset)
+                    offset += _SEGMENT.size
+                    yield start, end, names[name_id]
+            data = data[offset:]
+
+
+class _Level:
+    """Segments of one row with every gap up to ``gap`` merged away."""
+
+    __slots__ = ("gap", "starts", "ends", "consumed")
+
+    def __init__(self, gap):
+        self.gap = gap
+        self.starts = []
+        self.ends = []
+        self.consumed = 0   # raw segments merged so far
+
+
+class TraceIndex:
+    """Level-of-detail index over trace segments, one pyramid per task row.
+
+    Level 0 holds the raw segments of a row; level k merges every gap
+    shorter than ``resolution * 2**(k-1)``. ``query`` picks the coarsest
+    level whose merged gaps are below one pixel, so at most about two
+    segments per pixel and row are returned, whatever the trace length.
+    A level is built from the raw segments on first use (one pass) and
+    extended incrementally as segments are added, so the index can grow
+    while a simulation runs.
+    """
+
+    def __init__(self, segments=(), skip=("Idle",), resolution=1e-3, levels=32):
+        self.skip = frozenset(skip)
+        self.resolution = resolution
+        self.levels = levels
+        self.end = 0.0
+        self._rows = {}     # name -> {level number: _Level}, 0 being the raw segments
+        for segment in segments:
+            self.add(segment)
+
+    def add(self, segment):
+        start, end, name = segment
+        if end > self.end:
+            self.end = end
+        if name in self.skip:
+            return
+        row = self._rows.get(name)
+        if row is None:
+            row = self._rows[name] = {0: _Level(0.0)}
+        raw = row[0]
+        raw.starts.append(start)
+        raw.ends.append(end)
+
+    __call__ = add
+
+    def names(self):
+        return list(self._rows)
+
+    def __len__(self):
+        return sum(len(row[0].starts) for row in self._rows.values())
+
+    def _level(self, row, k):
+        raw = row[0]
+        if k == 0:
+            return raw
+        level = row.get(k)
+        if level is None:
+            level = row[k] = _Level(self.resolution * 2 ** (k - 1))
+        starts, ends = level.starts, level.ends
+        gap = level.gap
+        for start, end in zip(raw.starts[level.consumed:], raw.ends[level.consumed:]):
+            if ends and start - ends[-1] <= gap:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        level.consumed = len(raw.starts)
+        return level
+
+    def level_for(self, pixel_width):
+        """Coarsest level whose merged gaps stay below ``pixel_width``."""
+        if pixel_width <= self.resolution:
+            return 0
+        return min(self.levels, 1 + int(math.log2(pixel_width / self.resolution)))
+
+    def query(self, t0, t1, pixels):
+        """Segments overlapping ``[t0, t1]`` drawn ``pixels`` wide.
+
+        Returns ``{name: [(start, width), ...]}``, ready for ``broken_barh``.
+        """
+        k = self.level_for((t1 - t0) / max(pixels, 1))
+        visible = {}
+        for name, row in self._rows.items():
+            level = self._level(row, k)
+            # Ends are sorted as well, so the first visible segment is found by bisection
+            lo = bisect.bisect_left(level.ends, t0)
+            hi = bisect.bisect_right(level.starts, t1, lo)
+            visible[name] = [(start, end - start)
+                             for start, end in zip(level.starts[lo:hi], level.ends[lo:hi])]
+        return visible
@@ -0,0 +1,65 @@
+"""Cycle replication must not change what a run reports."""
+import pytest
+
+from rts_core import SERVER_TYPES, SimulationEngine, Task, server_supported
+
+
+def run(tasks, algo, server_type, duration, detect_cycles):
+    engine = SimulationEngine(tasks, algo, server_type, 6, 1, detect_cycles=detect_cycles)
+    engine.run(duration)
+    return engine
+
+
+def assert_same_run(tasks, algo, server_type, duration=200):
+    replayed = run(tasks, algo, server_type, duration, True)
+    simulated = run(tasks, algo, server_type, duration, False)
+    assert replayed.time_log == simulated.time_log
+    assert replayed.error_info == simulated.error_info
+    assert replayed.aperiodic_responses == simulated.aperiodic_responses
+
+
+@pytest.mark.parametrize("server_type", SERVER_TYPES)
+@pytest.mark.parametrize("first_arrival", [0, 4, 12])
+def test_aperiodic_work_is_not_replayed(server_type, first_arrival):
+    algo = "Earliest Deadline First (EDF)"
+    assert server_supported(algo, server_type)
+    tasks = [Task("P1", 0, 1.5, 4, 4, 'Periodic'),
+             Task("P2", 0, 1, 12, 12, 'Periodic'),
+             Task("A1", first_arrival, 1, 0, 99999, 'Aperiodic'),
+             Task("A2", first_arrival + 12, 1, 0, 99999, 'Aperiodic')]
+    assert_same_run(tasks, algo, server_type)
+
+
+def test_background_arrival_on_checkpoint():
+    tasks = [Task("P1", 0, 1.5, 4, 4, 'Periodic'),
+             Task("A1", 4, 1, 0, 99999, 'Aperiodic'),
+             Task("A2", 8, 1, 0, 99999, 'Aperiodic')]
+    engine = run(tasks, "Deadline Monotonic (DM)", "Background", 40, True)
+    assert sum(end - start for start, end, name in engine.time_log if name == "A2") == 1
+    assert_same_run(tasks, "Deadline Monotonic (DM)", "Background", 40)
+
+
+def test_misses_of_replayed_cycles_are_counted():
+    tasks = [Task("P1", 0, 2, 4, 4, 'Periodic'), Task("P2", 0, 3, 6, 6, 'Periodic')]
+    counts = []
+    for detect_cycles in (True, False):
+        engine = SimulationEngine(tasks, "Rate Monotonic (RM)", "Background", 1, 0,
+                                  detect_cycles=detect_cycles, continue_after_miss=True)
+        engine.run(1200)
+        counts.append(engine.deadline_misses)
+    assert counts == [100, 100]
+
+
+def test_unreachable_hyperperiod_is_not_buffered():
+    tasks = [Task(f"P{k}", 0, 0.1, 7.3 + k / 10, 7.3 + k / 10, 'Periodic') for k in range(6)]
+    engine = SimulationEngine(tasks, "Rate Monotonic (RM)", "Background", 1, 0, keep_log=False)
+    engine.run(5000)
+    assert engine._cycle_segments is None
+
+
+def test_cycle_buffer_is_capped(monkeypatch):
+    monkeypatch.setattr("rts_core.MAX_CYCLE_SEGMENTS", 3)
+    tasks = [Task("P1", 0, 1, 4, 4, 'Periodic'), Task("P2", 0, 2, 6, 6, 'Periodic')]
+    engine = run(tasks, "Rate Monotonic (RM)", "Background", 1000, True)
+    assert engine.cycle_start is None and engine._cycle_segments is None
+    assert engine.time_log == run(tasks, "Rate Monotonic (RM)", "Background", 1000, False).time_log